@@ -0,0 +1,100 @@
+"""
+Compares the on-disk size of a saved level against its load time for every level codec.
+
+Run from the repository root:
+    python -m benchmarks.compression_benchmark
+"""
+
+import argparse
+import importlib.util
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from level import Level, LevelLoader
+from level.compression import CODECS, read_level_data
+
+
+def build_realistic_level(size: tuple[int, int], fill_ratio: float, seed: int):
+    """Builds a level of the given size with randomly scattered platform clusters."""
+    level = LevelLoader().level
+    width, height = level.map.grid_size
+    level.map.multidirectional_expand_towards(["right"], size[0] - width)
+    level.map.multidirectional_expand_towards(["bottom"], size[1] - height)
+
+    rng = random.Random(seed)
+    width, height = level.map.grid_size
+    positions = []
+    for _ in range(int(width * height * fill_ratio / 9)):
+        x, y = rng.randrange(2, width - 4), rng.randrange(2, height - 4)
+        positions.extend((x + dx, y + dy) for dx in range(3) for dy in range(3))
+    level.map.tilemap.create_multiple_platforms_at(positions)
+
+    return level
+
+
+def available_codecs():
+    if importlib.util.find_spec("zstandard") is None:
+        return [codec for codec in CODECS if codec != "zstd"]
+    return list(CODECS)
+
+
+def benchmark_codec(level: Level, directory: Path, codec, repeats: int):
+    start = time.perf_counter()
+    path = level.save(directory / "level.json", codec=codec)
+    save_time = time.perf_counter() - start
+
+    parse_times = []
+    load_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read_level_data(path)
+        parse_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        Level.load(path)
+        load_times.append(time.perf_counter() - start)
+
+    return {
+        "codec": codec,
+        "size": path.stat().st_size,
+        "save_ms": save_time * 1000,
+        "parse_ms": min(parse_times) * 1000,
+        "load_ms": min(load_times) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=100)
+    parser.add_argument("--fill-ratio", type=float, default=0.3)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    level = build_realistic_level((args.width, args.height), args.fill_ratio, args.seed)
+
+    print(f"Level of {level.map.grid_size[0]}x{level.map.grid_size[1]} tiles")
+    print(
+        f"{'codec':<6} {'size (KiB)':>11} {'ratio':>7} {'save (ms)':>10} "
+        f"{'parse (ms)':>11} {'load (ms)':>10}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            benchmark_codec(level, Path(directory), codec, args.repeats)
+            for codec in available_codecs()
+        ]
+
+    plain_size = results[0]["size"]
+    for result in results:
+        print(
+            f"{result['codec']:<6} {result['size'] / 1024:>11.1f} "
+            f"{plain_size / result['size']:>7.1f} {result['save_ms']:>10.1f} "
+            f"{result['parse_ms']:>11.1f} {result['load_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
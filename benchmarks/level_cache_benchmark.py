@@ -0,0 +1,83 @@
+"""
+Compares the cost of loading a saved level through the level cache against a cold load and
+against rebuilding it from cached level data, and checks that cache hits and misses give
+equivalent levels.
+
+Run from the repository root:
+    python -m benchmarks.level_cache_benchmark
+"""
+
+import argparse
+import copy
+import tempfile
+import time
+from pathlib import Path
+
+from level import Level
+from level.compression import read_level_data
+from level.level_bootstrap import LevelCache
+
+from .compression_benchmark import build_realistic_level
+
+
+def best_time_ms(function, repeats: int):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def locked_tiles(level: Level):
+    return {
+        (element.layer.name, element.position)
+        for element in level.map.tilemap.all_elements
+        if element.locked
+    }
+
+
+def check_equivalent(miss: Level, hit: Level):
+    if miss.to_hash() != hit.to_hash() or locked_tiles(miss) != locked_tiles(hit):
+        raise AssertionError("A cache hit and a cache miss gave different levels.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=100)
+    parser.add_argument("--fill-ratio", type=float, default=0.3)
+    parser.add_argument("--codec", default="json")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    level = build_realistic_level((args.width, args.height), args.fill_ratio, args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = level.save(Path(directory) / "level.json", codec=args.codec)
+        cache = LevelCache()
+
+        cold_ms = best_time_ms(lambda: Level.load(path), args.repeats)
+        # Caching the parsed data instead needs a copy per load, so callers can't corrupt it.
+        data = read_level_data(path)
+        data_ms = best_time_ms(
+            lambda: Level.from_dict(copy.deepcopy(data)), args.repeats
+        )
+        check_equivalent(cache.get(path), cache.get(path))
+        hit_ms = best_time_ms(lambda: cache.get(path), args.repeats)
+        stats = cache.stats
+
+    print(f"Level of {level.map.grid_size[0]}x{level.map.grid_size[1]} tiles")
+    print(
+        f"{'cold load (ms)':>15} {'cached data (ms)':>17} {'cache hit (ms)':>15} "
+        f"{'speedup':>8} {'entry (KiB)':>12}"
+    )
+    print(
+        f"{cold_ms:>15.1f} {data_ms:>17.1f} {hit_ms:>15.1f} {cold_ms / hit_ms:>8.1f} "
+        f"{stats['bytes'] / 1024:>12.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
-from .level_bootstrap import LevelLoader
-from .level import Level
-from . import serialization
+from typing import TYPE_CHECKING
 
-serialization.initialize_level_deserializers()
+if TYPE_CHECKING:
+    from .level_bootstrap import LevelLoader
+    from .level import Level
 
 __all__ = ["LevelLoader", "Level"]
+
+_EXPORTS = {"LevelLoader": ".level_bootstrap", "Level": ".level"}
+
+
+def __getattr__(name: str):
+    # The exports are imported on first use, so the modules that don't need pytiling
+    # (compression, windowing, packed grids...) can be imported on their own.
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,239 @@
+"""
+Batch operations on saved levels, run across a pool of worker processes.
+
+Usage:
+    python -m level validate PATH...
+    python -m level hash PATH...
+    python -m level convert PATH... --to lzma
+    python -m level resave PATH...
+    python -m level stats PATH...
+
+Each PATH is a level file or a folder searched recursively for level files (in any codec).
+Results go to stdout, one line per level; progress and throughput go to stderr.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from .compression import (
+    CODECS,
+    codec_from_path,
+    find_level_file,
+    read_level_data,
+    with_codec_suffix,
+    write_level_data,
+)
+
+
+def find_level_files(paths: list[str], file_name: str = "level.json"):
+    """
+    Returns the level files among the paths and inside the folders, without duplicates. A level
+    directory holding the file in several codecs yields a single file, the one `find_level_file`
+    would load.
+    """
+    names = {with_codec_suffix(file_name, codec).name for codec in CODECS}
+    found: dict[Path, None] = {}
+    for path in map(Path, paths):
+        if path.is_dir():
+            level_dirs = {
+                candidate.parent
+                for candidate in path.rglob("*")
+                if candidate.name in names and candidate.is_file()
+            }
+            for level_dir in sorted(level_dirs):
+                level_file = find_level_file(level_dir, file_name)
+                if level_file is not None:
+                    found[level_file] = None
+        elif path.is_file():
+            found[path] = None
+        else:
+            raise FileNotFoundError(f"No such level file or folder: {path}")
+    return list(found)
+
+
+def validate_level(path: Path, options: dict):
+    from . import Level
+
+    issues = Level.load(path).issues
+    return {"ok": not issues, "issues": issues}
+
+
+def hash_level(path: Path, options: dict):
+    from . import Level
+
+    return {"hash": Level.load(path).to_hash()}
+
+
+def convert_level(path: Path, options: dict):
+    target = with_codec_suffix(path, options["codec"])
+    if target == path:
+        return {"output": str(path), "skipped": True}
+
+    data = read_level_data(path)
+    write_level_data(data, target)
+    if not options["keep"]:
+        path.unlink()
+    return {"output": str(target), "size": target.stat().st_size}
+
+
+def resave_level(path: Path, options: dict):
+    from . import Level
+
+    Level.load(path).save(path)
+    return {"output": str(path), "size": path.stat().st_size}
+
+
+def level_stats(path: Path, options: dict):
+    from . import Level
+
+    level = Level.load(path)
+    mixed_map = level.map
+    return {
+        "name": level.name,
+        "codec": codec_from_path(path),
+        "file_size": path.stat().st_size,
+        "grid_size": list(mixed_map.grid_size),
+        "tiles": {
+            layer.name: mixed_map.pack_layer(layer.name).occupied_count()
+            for layer in mixed_map.tilemap.layers
+        },
+        "world_objects": {
+            layer.name: len(mixed_map.world_objects_map.layer_arrays(layer.name))
+            for layer in mixed_map.world_objects_map.layers
+        },
+    }
+
+
+COMMANDS = {
+    "validate": validate_level,
+    "hash": hash_level,
+    "convert": convert_level,
+    "resave": resave_level,
+    "stats": level_stats,
+}
+
+
+def _run_task(command: str, path: Path, options: dict):
+    try:
+        return path, COMMANDS[command](path, options), None
+    except Exception as error:
+        return path, None, f"{type(error).__name__}: {error}"
+
+
+def _format_result(command: str, result: dict):
+    if command == "validate":
+        return "ok" if result["ok"] else "; ".join(result["issues"])
+    if command == "hash":
+        return result["hash"]
+    if command in ("convert", "resave"):
+        return "unchanged" if result.get("skipped") else result["output"]
+
+    tiles = ", ".join(f"{name}={count}" for name, count in result["tiles"].items())
+    objects = ", ".join(
+        f"{name}={count}" for name, count in result["world_objects"].items()
+    )
+    width, height = result["grid_size"]
+    return (
+        f"{width}x{height} {result['codec']} {result['file_size']}B "
+        f"tiles: {tiles} objects: {objects}"
+    )
+
+
+def _report_progress(done: int, total: int, start: float):
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    sys.stderr.write(f"\r{done}/{total} levels ({rate:.1f} levels/s)")
+    sys.stderr.flush()
+
+
+def run(
+    command: str, paths: list[Path], options: dict, workers: int, output_json=False
+):
+    """Runs the command on every level and prints the results. Returns the process exit code."""
+    show_progress = sys.stderr.isatty()
+    failures = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _run_task,
+            [command] * len(paths),
+            paths,
+            [options] * len(paths),
+            chunksize=max(1, len(paths) // (workers * 4)),
+        )
+        for done, (path, result, error) in enumerate(results, start=1):
+            if show_progress:
+                sys.stderr.write("\r\033[K")
+            if error is not None or (command == "validate" and not result["ok"]):
+                failures += 1
+
+            if output_json:
+                print(json.dumps({"path": str(path), "result": result, "error": error}))
+            elif error is not None:
+                print(f"{path}\terror: {error}")
+            else:
+                print(f"{path}\t{_format_result(command, result)}")
+
+            if show_progress:
+                _report_progress(done, len(paths), start)
+
+    elapsed = time.perf_counter() - start
+    if show_progress:
+        sys.stderr.write("\r\033[K")
+    rate = len(paths) / elapsed if elapsed else 0.0
+    sys.stderr.write(
+        f"{len(paths)} levels in {elapsed:.2f}s ({rate:.1f} levels/s), "
+        f"{failures} failed\n"
+    )
+    return 1 if failures else 0
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m level", description=__doc__.splitlines()[1]
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    command_help = {
+        "validate": "report the issues of each level",
+        "hash": "print the hash of each level",
+        "convert": "convert level files to another codec",
+        "resave": "re-save levels with canonical formatting",
+        "stats": "print the size and element counts of each level",
+    }
+    for command, help_text in command_help.items():
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("paths", nargs="+", help="level files or folders")
+        subparser.add_argument(
+            "--file-name",
+            default="level.json",
+            help="level file name to look for in folders (default: level.json)",
+        )
+        subparser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1, help="worker processes"
+        )
+        subparser.add_argument(
+            "--json", action="store_true", help="print one JSON object per level"
+        )
+        if command == "convert":
+            subparser.add_argument("--to", required=True, choices=CODECS)
+            subparser.add_argument(
+                "--keep", action="store_true", help="keep the original files"
+            )
+
+    args = parser.parse_args(argv)
+    try:
+        paths = find_level_files(args.paths, args.file_name)
+    except FileNotFoundError as error:
+        parser.error(str(error))
+
+    options = {"codec": getattr(args, "to", None), "keep": getattr(args, "keep", False)}
+    return run(args.command, paths, options, max(1, args.workers), args.json)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
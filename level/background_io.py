@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, TypeVar
+from .compression import remove_other_variants, write_level_data
+
+if TYPE_CHECKING:
+    from .compression import Codec
+
+T = TypeVar("T")
+
+
+class _PendingSave:
+    def __init__(self, data: dict, codec: "Codec | None"):
+        self.data = data
+        self.codec = codec
+        self.future: "Future[Path]" = Future()
+
+
+class LevelSaveQueue:
+    """
+    Writes level snapshots to disk on a single worker thread, in submission order.
+    A save submitted while an earlier save of the same path is still waiting to run replaces
+    that save's data and shares its future, so bursts of autosaves result in a single write.
+    Waiting saves can be cancelled through their future; a running save always completes.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="level-save"
+        )
+        self._pending: dict[Path, _PendingSave] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, data: dict, path: Path, codec: "Codec | None" = None):
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is not None and not pending.future.cancelled():
+                pending.data = data
+                pending.codec = codec
+                return pending.future
+
+            pending = _PendingSave(data, codec)
+            self._pending[path] = pending
+
+        self._executor.submit(self._write, path, pending)
+        return pending.future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _write(self, path: Path, pending: _PendingSave):
+        with self._lock:
+            if self._pending.get(path) is pending:
+                del self._pending[path]
+            data, codec = pending.data, pending.codec
+
+        if not pending.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_level_data(data, path, codec)
+            remove_other_variants(path)
+        except BaseException as error:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(path)
+
+
+_save_queue: LevelSaveQueue | None = None
+_load_executor: ThreadPoolExecutor | None = None
+_executors_lock = threading.Lock()
+
+
+def get_save_queue():
+    """Returns the process-wide queue used by Level.save_async."""
+    global _save_queue
+    with _executors_lock:
+        if _save_queue is None:
+            _save_queue = LevelSaveQueue()
+        return _save_queue
+
+
+def run_in_load_worker(func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+    """Runs a level loading function on the process-wide loading worker threads."""
+    global _load_executor
+    with _executors_lock:
+        if _load_executor is None:
+            _load_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="level-load"
+            )
+    return _load_executor.submit(func, *args, **kwargs)
@@ -0,0 +1,127 @@
+import json
+import lzma
+import zlib
+from pathlib import Path
+from typing import Literal, cast
+
+Codec = Literal["json", "zlib", "lzma", "zstd"]
+
+CODEC_EXTENSIONS: dict[str, str] = {
+    "json": "",
+    "zlib": ".zz",
+    "lzma": ".xz",
+    "zstd": ".zst",
+}
+CODECS = cast(tuple[Codec, ...], tuple(CODEC_EXTENSIONS))
+
+
+def codec_from_path(path: str | Path) -> Codec:
+    """Infers the codec of a level file from its extension (e.g. 'level.json.xz' -> 'lzma')."""
+    suffix = Path(path).suffix
+    for codec, extension in CODEC_EXTENSIONS.items():
+        if extension and suffix == extension:
+            return cast(Codec, codec)
+    return "json"
+
+
+def with_codec_suffix(path: str | Path, codec: Codec) -> Path:
+    """Returns the path with its codec extension replaced by the one of the given codec."""
+    _validate_codec(codec)
+    path = Path(path)
+    current_extension = CODEC_EXTENSIONS[codec_from_path(path)]
+    if current_extension:
+        path = path.with_name(path.name[: -len(current_extension)])
+    return path.with_name(path.name + CODEC_EXTENSIONS[codec])
+
+
+def find_level_file(dir_path: str | Path, file_name: str = "level.json") -> Path | None:
+    """
+    Finds a level file inside a directory, among the plain file and its compressed variants. If
+    several variants exist (e.g. left over by a save with another codec), the most recently
+    modified one wins.
+    """
+    newest: tuple[int, Path] | None = None
+    for candidate in level_file_variants(Path(dir_path) / file_name):
+        try:
+            modified = candidate.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        if newest is None or modified > newest[0]:
+            newest = (modified, candidate)
+    return newest[1] if newest else None
+
+
+def level_file_variants(path: str | Path):
+    """Returns the paths of the level file in every codec, the plain one first."""
+    return [with_codec_suffix(path, codec) for codec in CODECS]
+
+
+def remove_other_variants(path: str | Path):
+    """Deletes the variants of a level file written with other codecs, so they can't go stale."""
+    path = Path(path)
+    for variant in level_file_variants(path):
+        if variant != path:
+            variant.unlink(missing_ok=True)
+
+
+def read_level_data(path: str | Path, codec: Codec | None = None) -> dict:
+    """Reads and parses the level dictionary stored in a (possibly compressed) level file."""
+    codec = codec or codec_from_path(path)
+    return json.loads(decode_level_data(Path(path).read_bytes(), codec))
+
+
+def decode_level_data(payload: bytes, codec: Codec = "json") -> bytes:
+    """
+    Decompresses the content of a level file in one call. The JSON parser needs the whole text
+    anyway, and one-shot decompression is faster than feeding it through a decompressing stream.
+    """
+    _validate_codec(codec)
+    if codec == "json":
+        return payload
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    if codec == "lzma":
+        return lzma.decompress(payload)
+    # A decompression object also handles frames that don't record their content size.
+    return _require_zstandard().ZstdDecompressor().decompressobj().decompress(payload)
+
+
+def encode_level_data(data: dict, codec: Codec = "json") -> bytes:
+    """
+    Encodes a level dictionary with the given codec. Plain JSON keeps the indented, human readable
+    layout; compressed codecs use the compact one since nobody reads those files by hand.
+    """
+    _validate_codec(codec)
+    if codec == "json":
+        return json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    if codec == "zlib":
+        return zlib.compress(payload, 6)
+    if codec == "lzma":
+        return lzma.compress(payload, preset=6)
+    return _require_zstandard().ZstdCompressor(level=10).compress(payload)
+
+
+def write_level_data(data: dict, path: str | Path, codec: Codec | None = None):
+    """Writes a level dictionary to a file, compressing it according to the codec or the path."""
+    encoded = encode_level_data(data, codec or codec_from_path(path))
+    with open(path, "wb") as file:
+        file.write(encoded)
+
+
+def _validate_codec(codec: str):
+    if codec not in CODEC_EXTENSIONS:
+        raise ValueError(
+            f"Unknown level codec '{codec}'. Available codecs: {', '.join(CODECS)}."
+        )
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError(
+            "The 'zstd' level codec requires the optional 'zstandard' package."
+        ) from error
+    return zstandard
@@ -0,0 +1,97 @@
+import weakref
+from typing import Any, Callable
+
+Schedule = Callable[[Callable[[], None]], Any]
+
+
+class Subscription:
+    """Handle of a subscription to an EventBus topic. Can be used as a context manager."""
+
+    def __init__(self, bus: "EventBus", topic: str):
+        self._bus = bus
+        self.topic = topic
+        self.active = True
+
+    def unsubscribe(self):
+        if self.active:
+            self.active = False
+            self._bus._remove(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.unsubscribe()
+
+
+class EventBus:
+    """
+    Publishes values to any number of subscribers per topic.
+    Without a `schedule` function, values are delivered synchronously. With one (for instance a Tk
+    widget's `after_idle`), publications are coalesced: only the latest value of each topic is
+    delivered, once, when the scheduled flush runs, so a burst of updates within one UI frame
+    reaches each subscriber a single time.
+    """
+
+    def __init__(self, schedule: Schedule | None = None):
+        self.schedule = schedule
+        self._subscribers: dict[str, dict[Subscription, Callable[[], Any]]] = {}
+        self._pending: dict[str, Any] = {}
+        self._flush_scheduled = False
+
+    def subscribe(
+        self, topic: str, callback: Callable[[Any], None], weak: bool = False
+    ) -> Subscription:
+        """
+        Subscribes a callback to a topic. With `weak`, the bus only keeps a weak reference to the
+        callback (or to the instance of a bound method) and drops the subscription once it dies.
+        """
+        subscription = Subscription(self, topic)
+        if weak:
+            reference_type = (
+                weakref.WeakMethod if hasattr(callback, "__self__") else weakref.ref
+            )
+            resolve = reference_type(callback, lambda _: subscription.unsubscribe())
+        else:
+            resolve = lambda: callback
+
+        self._subscribers.setdefault(topic, {})[subscription] = resolve
+        return subscription
+
+    def publish(self, topic: str, value: Any):
+        if self.schedule is None:
+            self._deliver(topic, value)
+            return
+
+        self._pending[topic] = value
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self):
+        """Delivers the coalesced publications right away."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        for topic, value in pending.items():
+            self._deliver(topic, value)
+
+    def subscriber_count(self, topic: str):
+        return len(self._subscribers.get(topic, ()))
+
+    def _deliver(self, topic: str, value: Any):
+        subscribers = self._subscribers.get(topic)
+        if not subscribers:
+            return
+        for subscription, resolve in list(subscribers.items()):
+            callback = resolve()
+            if callback is None:
+                subscription.unsubscribe()
+            elif subscription.active:
+                callback(value)
+
+    def _remove(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.pop(subscription, None)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
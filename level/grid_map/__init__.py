@@ -1,3 +1,15 @@
-from .mixed_map import MixedMap
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mixed_map import MixedMap
 
 __all__ = ["MixedMap"]
+
+
+def __getattr__(name: str):
+    # Imported on first use, like the exports of the level package.
+    if name != "MixedMap":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .mixed_map import MixedMap
+
+    return MixedMap
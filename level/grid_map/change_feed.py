@@ -0,0 +1,253 @@
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from pytiling import GridMap
+
+Position = tuple[int, int]
+Rect = tuple[int, int, int, int]
+"""A rectangle of cells given as (x, y, width, height)."""
+
+
+class MapChange:
+    """
+    Everything that changed in a map during one batch. `dirty_rects` covers every cell whose
+    rendering may have changed (including autotiled neighbours), per layer. If the map was
+    resized, `offset` is how far the previously existing content moved and the whole map is dirty.
+    A cell whose element was replaced by a different one appears in both `removed` and `added`.
+    Positions are always in the coordinates of the map at the end of the batch: those recorded
+    before a resize are moved by its offset, so removals of cells cut off by the resize can fall
+    outside the map.
+    """
+
+    def __init__(self):
+        self.added: dict[str, list[Position]] = {}
+        self.removed: dict[str, list[Position]] = {}
+        self.dirty_rects: dict[str, list[Rect]] = {}
+        self.resized = False
+        self.offset: Position = (0, 0)
+        self.grid_size: Position = (0, 0)
+
+    @property
+    def is_empty(self):
+        return not (self.added or self.removed or self.dirty_rects or self.resized)
+
+    def __repr__(self):
+        return (
+            f"MapChange(added={self.added}, removed={self.removed}, "
+            f"dirty_rects={self.dirty_rects}, resized={self.resized}, offset={self.offset})"
+        )
+
+
+class ChangeFeed:
+    """
+    Collects element additions, removals and resizes of a map and notifies subscribers with one
+    coalesced MapChange per batch. Changes recorded outside of a batch are emitted right away.
+    """
+
+    def __init__(self, grid_map: "GridMap"):
+        self._grid_map = grid_map
+        self._subscribers: list[Callable[[MapChange], None]] = []
+        self._depth = 0
+        # Changed positions per layer, each with the identity of the element added or removed.
+        self._added: dict[str, dict[Position, object]] = {}
+        self._removed: dict[str, dict[Position, object]] = {}
+        self._dirty: dict[str, set[Position]] = {}
+        self._resized = False
+        self._offset = (0, 0)
+
+    def subscribe(self, callback: Callable[[MapChange], None]):
+        """Registers a callback for coalesced changes. Returns a function that unsubscribes it."""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    @contextmanager
+    def batch(self):
+        """Groups every change recorded inside the block into a single notification."""
+        self.begin()
+        try:
+            yield
+        finally:
+            change = self.end()
+            if change is not None:
+                self.publish(change)
+
+    def begin(self):
+        """Starts a (possibly nested) batch. Prefer `batch` unless the change must be published later."""
+        self._depth += 1
+
+    def end(self) -> MapChange | None:
+        """
+        Ends a batch started with `begin`. When the outermost batch ends, returns the coalesced
+        change, or None if nothing changed, for the caller to `publish`.
+        """
+        self._depth -= 1
+        if self._depth > 0:
+            return None
+        return self._collect()
+
+    def publish(self, change: MapChange):
+        """Notifies the subscribers of a change."""
+        for callback in list(self._subscribers):
+            callback(change)
+
+    def record_elements(
+        self,
+        layer_name: str,
+        added: Iterable[Position] = (),
+        removed: Iterable[Position] = (),
+        margin: int = 0,
+        identity: object = None,
+    ):
+        """
+        Records changed positions of a layer. Cells within `margin` of a change are marked dirty
+        too, for layers whose elements are rendered according to their neighbours. `identity`
+        identifies the element changed at those positions (e.g. the element itself): removing
+        and adding back an element with the same identity within a batch cancels out, while
+        replacing it with another one is kept as a removal and an addition. Changes recorded
+        without an identity are considered to be about the same element.
+        """
+        added_positions = self._added.setdefault(layer_name, {})
+        removed_positions = self._removed.setdefault(layer_name, {})
+        dirty = self._dirty.setdefault(layer_name, set())
+
+        for position in added:
+            self._mark_dirty(dirty, position, margin)
+            if (
+                position in removed_positions
+                and removed_positions[position] is identity
+            ):
+                del removed_positions[position]
+            else:
+                added_positions[position] = identity
+
+        for position in removed:
+            self._mark_dirty(dirty, position, margin)
+            if position in added_positions and added_positions[position] is identity:
+                del added_positions[position]
+            else:
+                removed_positions[position] = identity
+
+        if self._depth == 0:
+            self._emit()
+
+    def record_dirty(self, layer_name: str, positions: Iterable[Position]):
+        """Records cells of a layer that must be redrawn although no element was added or removed."""
+        dirty = self._dirty.setdefault(layer_name, set())
+        dirty.update(positions)
+
+        if self._depth == 0:
+            self._emit()
+
+    def record_resize(self, offset: Position):
+        """
+        Records a resize that moved the existing content by the given offset. Positions recorded
+        earlier in the batch are moved with the content.
+        """
+        self._resized = True
+        self._offset = (self._offset[0] + offset[0], self._offset[1] + offset[1])
+        if offset != (0, 0):
+            dx, dy = offset
+            for positions in (self._added, self._removed):
+                for layer_name, identities in positions.items():
+                    positions[layer_name] = {
+                        (x + dx, y + dy): identity
+                        for (x, y), identity in identities.items()
+                    }
+            for layer_name, cells in self._dirty.items():
+                self._dirty[layer_name] = {(x + dx, y + dy) for x, y in cells}
+
+        if self._depth == 0:
+            self._emit()
+
+    def _emit(self):
+        change = self._collect()
+        if change is not None:
+            self.publish(change)
+
+    def _collect(self):
+        """Builds the change recorded since the last one and starts a new one. Returns None if empty."""
+        change = MapChange()
+        grid_size = change.grid_size = self._grid_map.grid_size
+        change.resized = self._resized
+        change.offset = self._offset
+        change.added = {name: list(p) for name, p in self._added.items() if p}
+        change.removed = {name: list(p) for name, p in self._removed.items() if p}
+
+        width, height = grid_size
+        if self._resized:
+            change.dirty_rects = {
+                layer.name: [(0, 0, width, height)] for layer in self._grid_map.layers
+            }
+        else:
+            change.dirty_rects = {
+                name: cells_to_rects(
+                    (x, y) for x, y in cells if 0 <= x < width and 0 <= y < height
+                )
+                for name, cells in self._dirty.items()
+                if cells
+            }
+
+        self._added = {}
+        self._removed = {}
+        self._dirty = {}
+        self._resized = False
+        self._offset = (0, 0)
+
+        if change.is_empty:
+            return None
+        return change
+
+    @staticmethod
+    def _mark_dirty(dirty: set[Position], position: Position, margin: int):
+        if margin == 0:
+            dirty.add(position)
+            return
+        x, y = position
+        for dx in range(-margin, margin + 1):
+            for dy in range(-margin, margin + 1):
+                dirty.add((x + dx, y + dy))
+
+
+def cells_to_rects(cells: Iterable[Position]) -> list[Rect]:
+    """
+    Covers a set of cells with rectangles: cells are joined into horizontal runs per row, and
+    identical runs on consecutive rows are merged into one rectangle.
+    """
+    rows: dict[int, list[int]] = {}
+    for x, y in cells:
+        rows.setdefault(y, []).append(x)
+
+    open_rects: dict[tuple[int, int], list[int]] = {}
+    rects: list[Rect] = []
+    previous_y = None
+
+    for y in sorted(rows):
+        runs = []
+        xs = sorted(set(rows[y]))
+        start = previous = xs[0]
+        for x in xs[1:]:
+            if x != previous + 1:
+                runs.append((start, previous - start + 1))
+                start = x
+            previous = x
+        runs.append((start, previous - start + 1))
+
+        still_open: dict[tuple[int, int], list[int]] = {}
+        for run in runs:
+            rect = open_rects.pop(run, None) if previous_y == y - 1 else None
+            if rect is None:
+                rect = [run[0], y, run[1], 0]
+            rect[3] += 1
+            still_open[run] = rect
+        rects.extend(tuple(rect) for rect in open_rects.values())
+        open_rects = still_open
+        previous_y = y
+
+    rects.extend(tuple(rect) for rect in open_rects.values())
+    return rects
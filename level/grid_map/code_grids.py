@@ -0,0 +1,115 @@
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from .mixed_map import MixedMap
+
+Position = tuple[int, int]
+
+
+class CodeGrids:
+    """
+    One row-major byte grid per layer of a MixedMap, laid out like a PackedGrid: empty cells hold
+    0 and occupied cells the code of the element's name. Codes come from per-layer name tables
+    that only grow, so a name keeps its code for the lifetime of the map (code 1 is
+    `names[layer][0]`). Like the OccupancyMap, the grids are kept up to date through the map's
+    change notifications, invalidated by resizes and layer changes, and rebuilt by the MixedMap
+    under its write lock before being read.
+    """
+
+    def __init__(
+        self,
+        mixed_map: "MixedMap",
+        names: dict[str, list[str]] | None = None,
+    ):
+        self._mixed_map = mixed_map
+        self.cells: dict[str, bytearray] | None = None
+        self.width = 0
+        self.height = 0
+        self.names: dict[str, list[str]] = names if names is not None else {}
+        self._codes = {
+            layer_name: {name: code for code, name in enumerate(layer_names, 1)}
+            for layer_name, layer_names in self.names.items()
+        }
+
+    def invalidate(self):
+        self.cells = None
+
+    @property
+    def is_stale(self):
+        """Whether the grids must be rebuilt before being queried."""
+        return (
+            self.cells is None or (self.width, self.height) != self._mixed_map.grid_size
+        )
+
+    def private_copy(self):
+        """Returns unbuilt grids sharing no state with these ones, starting from the same codes."""
+        return CodeGrids(
+            self._mixed_map,
+            {layer_name: list(names) for layer_name, names in self.names.items()},
+        )
+
+    def rebuild(self):
+        mixed_map = self._mixed_map
+        self.width, self.height = mixed_map.grid_size
+        width = self.width
+        cells = {
+            layer.name: bytearray(self.width * self.height)
+            for layer in mixed_map.layers
+        }
+        for source in (mixed_map.tilemap, mixed_map.world_objects_map):
+            for element in source.all_elements:
+                layer_name = element.layer.name
+                grid = cells.get(layer_name)
+                if grid is not None:
+                    code = self._code(layer_name, element.name)
+                    if code is None:
+                        raise ValueError(
+                            "A code grid supports up to 255 element names."
+                        )
+                    x, y = element.position
+                    grid[y * width + x] = code
+        self.cells = cells
+
+    def update(
+        self,
+        layer_name: str,
+        added: Iterable[Position] = (),
+        removed: Iterable[Position] = (),
+    ):
+        """
+        Updates the cells of a layer where elements were added or removed, if the grids were
+        built, from the elements now in those cells.
+        """
+        if self.cells is None:
+            return
+        grid = self.cells.get(layer_name)
+        if grid is None or (self.width, self.height) != self._mixed_map.grid_size:
+            self.invalidate()
+            return
+
+        layer = self._mixed_map.get_layer(layer_name)
+        width = self.width
+        height = self.height
+        for positions in (removed, added):
+            for x, y in positions:
+                if not (0 <= x < width and 0 <= y < height):
+                    continue
+                element = layer.get_element_at((x, y))
+                code = 0 if element is None else self._code(layer_name, element.name)
+                if code is None:
+                    # Out of codes: the next query rebuilds the grids and reports it.
+                    self.invalidate()
+                    return
+                grid[y * width + x] = code
+
+    def _code(self, layer_name: str, name: str):
+        """Returns the code of a name in a layer, assigning the next one if it's new."""
+        codes = self._codes.setdefault(layer_name, {})
+        code = codes.get(name)
+        if code is None:
+            names = self.names.setdefault(layer_name, [])
+            if len(names) == 255:
+                return None
+            names.append(name)
+            code = codes[name] = len(names)
+        return code
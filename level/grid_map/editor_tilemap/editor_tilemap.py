@@ -1,5 +1,7 @@
 from pytiling import Tilemap, opposite_directions
-from typing import TYPE_CHECKING, cast, Literal
+from typing import TYPE_CHECKING, Iterable, Sequence, cast, Literal
+from contextlib import nullcontext
+from level.profiling import profiled, count_formatted_tiles
 import os
 
 
@@ -61,12 +63,31 @@ class EditorTilemap(Tilemap):
     def create_basic_platform_at(
         self, position: tuple[int, int], dynamic_resizing=False, **args
     ):
+        with self._batch():
+            tile = self._place_platform(position, **args)
+            if tile is not None:
+                self._notify_platforms_changed(added=(position,))
+
+                if dynamic_resizing:
+                    self._dynamic_reduce_grid(tile)
+
+        return tile
+
+    def _place_platform(self, position: tuple[int, int], **args):
+        """Creates a platform tile without reporting it to the MixedMap."""
+        # Cheap rejection through the occupancy map before the layer checks its concurrences.
+        if self._mixed_map is not None and self._mixed_map.conflicts_at(
+            position, "platforms"
+        ):
+            return None
+
         platforms = self.get_layer("platforms")
-        tile = platforms.create_autotile_tile_at(
-            position,
-            "platform",
-            **args,
-        )
+        with platforms.unreported():
+            tile = platforms.create_autotile_tile_at(
+                position,
+                "platform",
+                **args,
+            )
         if tile is not None:
 
             def _callback(sender, tile: "AutotileTile"):
@@ -74,16 +95,18 @@ class EditorTilemap(Tilemap):
                     tile.add_variations_from_json(self.SHALLOW_PLATFORMS_VARIATIONS)
 
             tile.events["post_autotile"].connect(_callback, weak=False)
-
-            if dynamic_resizing:
-                self._dynamic_reduce_grid(tile)
-
         return tile
 
+    @profiled("EditorTilemap.create_multiple_platforms_at")
     def create_multiple_platforms_at(self, positions: list[tuple[int, int]]):
+        with self._batch():
+            self._create_multiple_platforms_at(positions)
+
+    def _create_multiple_platforms_at(self, positions: list[tuple[int, int]]):
         tiles: list["AutotileTile"] = []
+        formatted_count = 0
         for x, y in positions:
-            tile = self.create_basic_platform_at((x, y), apply_formatting=False)
+            tile = self._place_platform((x, y), apply_formatting=False)
             if tile:
                 tiles.append(tile)
             else:
@@ -92,20 +115,246 @@ class EditorTilemap(Tilemap):
                 tile_in_place = self.get_layer("platforms").get_tile_at((x, y))
                 if tile_in_place:
                     tile_in_place.format()
+                    formatted_count += 1
+
+        self._notify_platforms_changed(added=[tile.position for tile in tiles])
 
         for tile in tiles:
             tile.format()
+        count_formatted_tiles(formatted_count + len(tiles))
 
     def remove_platform_at(
         self, position: tuple[int, int], dynamic_resizing=False, apply_formatting=False
     ):
         platforms = self.get_layer("platforms")
-        removed_tile = platforms.remove_tile_at(position, apply_formatting)
-        if removed_tile is not None and dynamic_resizing:
-            self._dynamic_expand_grid(removed_tile)
+        with self._batch():
+            with platforms.unreported():
+                removed_tile = platforms.remove_tile_at(position, apply_formatting)
+            if removed_tile is not None:
+                self._notify_platforms_changed(removed=(position,))
+                if dynamic_resizing:
+                    self._dynamic_expand_grid(removed_tile)
 
         return removed_tile
 
+    @profiled("EditorTilemap.fill_rect")
+    def fill_rect(self, rect: tuple[int, int, int, int], dynamic_resizing=False):
+        """Fills the (x, y, width, height) rectangle with platforms."""
+        return self._apply_region(self._rect_positions(rect), (), dynamic_resizing)
+
+    @profiled("EditorTilemap.clear_rect")
+    def clear_rect(self, rect: tuple[int, int, int, int], dynamic_resizing=False):
+        """Removes every platform inside the (x, y, width, height) rectangle."""
+        return self._apply_region((), self._rect_positions(rect), dynamic_resizing)
+
+    @profiled("EditorTilemap.flood_fill")
+    def flood_fill(self, position: tuple[int, int], dynamic_resizing=False):
+        """
+        Flips the area connected to the position (through its four neighbours) that has the same
+        content as it: an empty area gets filled with platforms and a platform area gets cleared.
+        """
+        platforms = self.get_layer("platforms")
+        if not self._is_inside(position):
+            return [], []
+
+        fill = platforms.get_tile_at(position) is None
+        area = {position}
+        frontier = [position]
+        while frontier:
+            x, y = frontier.pop()
+            for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbour in area or not self._is_inside(neighbour):
+                    continue
+                if (platforms.get_tile_at(neighbour) is None) == fill:
+                    area.add(neighbour)
+                    frontier.append(neighbour)
+
+        if fill:
+            return self._apply_region(area, (), dynamic_resizing)
+        return self._apply_region((), area, dynamic_resizing)
+
+    @profiled("EditorTilemap.apply_mask")
+    def apply_mask(
+        self,
+        mask: "Sequence[Sequence[bool]]",
+        origin: tuple[int, int] = (0, 0),
+        dynamic_resizing=False,
+    ):
+        """
+        Applies a boolean mask indexed as mask[y][x] (e.g. a 2D numpy array) with its top left
+        corner at `origin`: truthy cells get a platform and falsy cells are cleared.
+        """
+        origin_x, origin_y = origin
+        to_create = []
+        to_remove = []
+        for y, row in enumerate(mask):
+            for x, value in enumerate(row):
+                position = (origin_x + x, origin_y + y)
+                (to_create if value else to_remove).append(position)
+
+        return self._apply_region(to_create, to_remove, dynamic_resizing)
+
+    def _apply_region(
+        self,
+        to_create: Iterable[tuple[int, int]],
+        to_remove: Iterable[tuple[int, int]],
+        dynamic_resizing: bool,
+    ):
+        """
+        Creates and removes platforms with a single formatting pass over the changed cells and their
+        neighbours, one change notification for the removals and one for the creations, and a
+        single dynamic resize. Returns the created and the removed positions, in the coordinates
+        from before that resize.
+        """
+        platforms = self.get_layer("platforms")
+        created: list[tuple[int, int]] = []
+        removed: list[tuple[int, int]] = []
+        edges_to_expand: set["Direction"] = set()
+
+        with self._batch():
+            for position in to_remove:
+                if not self._is_inside(position):
+                    continue
+                with platforms.unreported():
+                    removed_tile = platforms.remove_tile_at(position, False)
+                if removed_tile is None:
+                    continue
+                removed.append(position)
+                if removed_tile.edges is not None:
+                    edges_to_expand.update(removed_tile.edges)
+            self._notify_platforms_changed(removed=removed)
+
+            for position in to_create:
+                if not self._is_inside(position):
+                    continue
+                if self._place_platform(position, apply_formatting=False):
+                    created.append(position)
+            self._notify_platforms_changed(added=created)
+
+            self._format_around(created + removed)
+
+            if dynamic_resizing:
+                # Removed border tiles expand their edges by one cell. Filled semi-edges reduce
+                # theirs by every line full of platforms, as `reduce_towards_if_needed` would.
+                reductions = {
+                    edge: self._count_full_lines(edge)
+                    for edge in self._get_semiedge_directions(created)
+                    if edge not in edges_to_expand
+                }
+                self._resize_for_region(
+                    edges_to_expand,
+                    {edge: lines for edge, lines in reductions.items() if lines},
+                )
+
+        return created, removed
+
+    def _resize_for_region(
+        self, edges_to_expand: "set[Direction]", reductions: "dict[Direction, int]"
+    ):
+        """Applies the expansions and reductions of a region edit with a single resize."""
+        if not edges_to_expand and not reductions:
+            return
+
+        def change(edge: "Direction"):
+            return 1 if edge in edges_to_expand else -reductions.get(edge, 0)
+
+        width, height = self.grid_size
+        self.mixed_map.resize_to(
+            (
+                -change("left"),
+                -change("top"),
+                width + change("right"),
+                height + change("bottom"),
+            )
+        )
+
+        for edge in sorted(edges_to_expand):
+            self.lock_edge_axis_if_needed(edge)
+        # Like after a first reduction, the reduced edges and their opposites can expand again.
+        for edge in reductions:
+            self.unlock_edge(edge)
+            self.unlock_edge(opposite_directions[edge])
+
+    def _count_full_lines(self, edge: "Direction"):
+        """Counts the consecutive lines full of platforms, starting one cell inside the edge."""
+        platforms = self.get_layer("platforms")
+        width, height = self.grid_size
+        horizontal = edge in ("left", "right")
+        depth, length = (width, height) if horizontal else (height, width)
+
+        count = 0
+        for retreat in range(1, depth - 1):
+            line = depth - 1 - retreat if edge in ("right", "bottom") else retreat
+            for index in range(length):
+                tile = platforms.get_tile_at(
+                    (line, index) if horizontal else (index, line)
+                )
+                if tile is None or tile.name != "platform":
+                    return count
+            count += 1
+        return count
+
+    def _format_around(self, positions: Iterable[tuple[int, int]]):
+        """Formats the tiles at the positions and their neighbours, each of them once."""
+        platforms = self.get_layer("platforms")
+        to_format: set[tuple[int, int]] = set()
+        for x, y in positions:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    to_format.add((x + dx, y + dy))
+
+        formatted_count = 0
+        for position in to_format:
+            if not self._is_inside(position):
+                continue
+            tile = platforms.get_tile_at(position)
+            if tile is not None:
+                tile.format()
+                formatted_count += 1
+        count_formatted_tiles(formatted_count)
+
+    def _get_semiedge_directions(self, positions: Iterable[tuple[int, int]]):
+        grid_width, grid_height = self.grid_size
+        directions: list["Direction"] = []
+        for x, y in positions:
+            if x == 1 and "left" not in directions:
+                directions.append("left")
+            if x == grid_width - 2 and "right" not in directions:
+                directions.append("right")
+            if y == 1 and "top" not in directions:
+                directions.append("top")
+            if y == grid_height - 2 and "bottom" not in directions:
+                directions.append("bottom")
+        return directions
+
+    @staticmethod
+    def _rect_positions(rect: tuple[int, int, int, int]):
+        x, y, width, height = rect
+        return [
+            (column, row)
+            for row in range(y, y + height)
+            for column in range(x, x + width)
+        ]
+
+    def _is_inside(self, position: tuple[int, int]):
+        x, y = position
+        grid_width, grid_height = self.grid_size
+        return 0 <= x < grid_width and 0 <= y < grid_height
+
+    def _batch(self):
+        """Groups the changes of an edit into one MixedMap change notification, if attached to one."""
+        if self._mixed_map is None:
+            return nullcontext()
+        return self._mixed_map.batch()
+
+    def _notify_platforms_changed(
+        self,
+        added: Iterable[tuple[int, int]] = (),
+        removed: Iterable[tuple[int, int]] = (),
+    ):
+        if self._mixed_map is not None:
+            self._mixed_map.notify_elements_changed("platforms", added, removed)
+
     def _dynamic_reduce_grid(self, new_tile: "Tile"):
         if self._is_semiedge(new_tile.position) is False:
             return
@@ -156,13 +405,18 @@ class EditorTilemap(Tilemap):
             self.lock_edge_axis_if_needed(edge)
 
     def lock_edge(self, edge: "Direction"):
-        self.locked_edges.add(edge)
-
-        platforms = self.get_layer("platforms")
-        elements = platforms.get_edge_elements(edge)
-        for element in elements:
-            if element is not None:
-                element.locked = True
+        with self._batch():
+            self.locked_edges.add(edge)
+
+            platforms = self.get_layer("platforms")
+            elements = platforms.get_edge_elements(edge)
+            positions = []
+            for element in elements:
+                if element is not None:
+                    element.locked = True
+                    positions.append(element.position)
+            if self._mixed_map is not None:
+                self._mixed_map.mark_changed("platforms", positions)
 
     def lock_edges_if_needed(self):
         self.lock_edge_axis_if_needed("left")
@@ -187,13 +441,18 @@ class EditorTilemap(Tilemap):
             self.lock_edge(edge)
 
     def unlock_edge(self, edge: "Direction"):
-        self.locked_edges.discard(edge)
-
-        platforms = self.get_layer("platforms")
-        elements = platforms.get_edge_elements(edge)
-        for element in elements:
-            if element is not None:
-                element.locked = False
+        with self._batch():
+            self.locked_edges.discard(edge)
+
+            platforms = self.get_layer("platforms")
+            elements = platforms.get_edge_elements(edge)
+            positions = []
+            for element in elements:
+                if element is not None:
+                    element.locked = False
+                    positions.append(element.position)
+            if self._mixed_map is not None:
+                self._mixed_map.mark_changed("platforms", positions)
 
     def unlock_expandable_edges(self):
         for edge in ["left", "right", "top", "bottom"]:
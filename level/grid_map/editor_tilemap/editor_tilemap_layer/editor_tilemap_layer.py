@@ -1,10 +1,18 @@
 from pytiling import TilemapLayer
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...mixed_map import MixedMap
 
 
 class EditorTilemapLayer(TilemapLayer):
     def __init__(self, name: str, tileset, icon_path: str):
         super().__init__(name, tileset)
         self.icon_path = icon_path
+        # Set by the MixedMap the layer is populated into, to report tile changes to it.
+        self.mixed_map: "MixedMap | None" = None
+        self._unreported_depth = 0
 
     def to_dict(self):
         """Serialize the layer to a dictionary with asset-relative paths."""
@@ -16,3 +24,46 @@ class EditorTilemapLayer(TilemapLayer):
         data["icon_path"] = to_asset_relative_path(self.icon_path)
         data["tileset"] = to_asset_relative_path(self.tileset.tileset_path)
         return data
+
+    def create_tile_at(self, position: tuple[int, int], *args, **kwargs):
+        return self._create_reported(super().create_tile_at, position, *args, **kwargs)
+
+    def create_autotile_tile_at(self, position: tuple[int, int], *args, **kwargs):
+        return self._create_reported(
+            super().create_autotile_tile_at, position, *args, **kwargs
+        )
+
+    def remove_tile_at(self, position: tuple[int, int], *args, **kwargs):
+        if self.mixed_map is None or self._unreported_depth:
+            return super().remove_tile_at(position, *args, **kwargs)
+
+        with self.mixed_map.batch():
+            with self.unreported():
+                tile = super().remove_tile_at(position, *args, **kwargs)
+            if tile is not None:
+                self.mixed_map.notify_elements_changed(self.name, removed=(position,))
+        return tile
+
+    @contextmanager
+    def unreported(self):
+        """
+        Stops the layer from reporting the tiles created and removed inside the block to its
+        MixedMap, for callers that report a whole edit at once.
+        """
+        self._unreported_depth += 1
+        try:
+            yield
+        finally:
+            self._unreported_depth -= 1
+
+    def _create_reported(self, create, position: tuple[int, int], *args, **kwargs):
+        if self.mixed_map is None or self._unreported_depth:
+            return create(position, *args, **kwargs)
+
+        with self.mixed_map.batch():
+            with self.unreported():
+                tile = create(position, *args, **kwargs)
+            # The tile may be rejected (e.g. by a layer concurrence), so only report it if it landed.
+            if tile is not None:
+                self.mixed_map.notify_elements_changed(self.name, added=(position,))
+        return tile
@@ -1,8 +1,17 @@
 from pytiling import GridMap
-from typing import TYPE_CHECKING, cast
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Sequence, cast
 from .editor_tilemap import EditorTilemap
 from .world_objects_map import WorldObjectsMap
+from .change_feed import ChangeFeed
+from .packed_grid import PackedGrid
+from .occupancy_map import OccupancyMap
+from .code_grids import CodeGrids
+from .windowing import extract_windows
 from level.config import LAYER_ORDER
+from level.profiling import profiled
+from level.rw_lock import ReadWriteLock
+from level.serialization import initialize_level_deserializers
 
 if TYPE_CHECKING:
     from level.grid_map.editor_tilemap.editor_tilemap_layer import (
@@ -30,6 +39,27 @@ class MixedMap(GridMap):
         self.world_objects_map = WorldObjectsMap(
             tile_size, grid_size, min_grid_size, max_grid_size, mixed_map=self
         )
+        self.changes = ChangeFeed(self)
+        self.layer_concurrences: list[tuple[str, ...]] = []
+        self.occupancy = OccupancyMap(self)
+        self.code_grids = CodeGrids(self)
+        # Edits hold the write lock through `batch`; background readers take `lock.read()`.
+        self.lock = ReadWriteLock()
+        self.version = 0
+
+    def __getstate__(self):
+        """
+        Leaves out the lock, which can't be copied or pickled, so that it doesn't stop
+        `copy.deepcopy` or pickle on the map, nor on the tilemap and world objects map that
+        reference it. Copies get a fresh lock.
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.lock = ReadWriteLock()
 
     def to_dict(self):
         """Serialize the map to a dictionary."""
@@ -65,15 +95,248 @@ class MixedMap(GridMap):
 
         cls._setup_concurrency_from_data(all_layers_data, instance)
 
+        # pytiling may set the concurrences up without going through `add_layer_concurrence`,
+        # so the ones it didn't report are read from the layer data as well.
+        recorded = {frozenset(names) for names in instance.layer_concurrences}
+        for names in cls._concurrences_from_layers_data(all_layers_data):
+            if frozenset(names) not in recorded:
+                recorded.add(frozenset(names))
+                instance.layer_concurrences.append(names)
+
         return instance
 
+    @staticmethod
+    def _concurrences_from_layers_data(layers_data: list[dict]):
+        """
+        Returns the pairs of concurrent layers found in pytiling's per-layer data, where a layer
+        lists the names of the other layers it is concurrent with.
+        """
+        names = {layer_data["name"] for layer_data in layers_data}
+        pairs: list[tuple[str, ...]] = []
+        seen: set[frozenset[str]] = set()
+        for layer_data in layers_data:
+            name = layer_data["name"]
+            for value in layer_data.values():
+                if not isinstance(value, list) or not value:
+                    continue
+                if not all(
+                    isinstance(other, str) and other in names and other != name
+                    for other in value
+                ):
+                    continue
+                for other in value:
+                    pair = frozenset((name, other))
+                    if pair not in seen:
+                        seen.add(pair)
+                        pairs.append((name, other))
+        return pairs
+
+    def add_layer_concurrence(self, *layer_names: str):
+        """Makes the layers concurrent, and keeps track of it so the map can be rebuilt."""
+        super().add_layer_concurrence(*layer_names)
+        self.layer_concurrences.append(layer_names)
+
     def populate_layers(self):
-        for layer_name in LAYER_ORDER:
-            if self.tilemap.has_layer(layer_name):
-                self.add_layer(self.tilemap.get_layer(layer_name))
+        with self.lock.write():
+            for layer_name in LAYER_ORDER:
+                if self.tilemap.has_layer(layer_name):
+                    layer = self.tilemap.get_layer(layer_name)
+                    layer.mixed_map = self
+                    self.add_layer(layer)
+
+                if self.world_objects_map.has_layer(layer_name):
+                    layer = self.world_objects_map.get_layer(layer_name)
+                    layer.mixed_map = self
+                    self.add_layer(layer)
+
+            self.occupancy.invalidate()
+            self.code_grids.invalidate()
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups every change made inside the block into a single notification to the subscribers
+        of `changes`, holding the write lock for the whole block. Batches can be nested; the
+        notification is sent when the outermost one ends, once the write lock is released, so
+        subscribers can read the map from other threads without blocking the editing one.
+        """
+        change = None
+        try:
+            with self.lock.write():
+                self.changes.begin()
+                try:
+                    yield
+                finally:
+                    change = self.changes.end()
+        finally:
+            if change is not None:
+                self.changes.publish(change)
+
+    def notify_elements_changed(
+        self,
+        layer_name: str,
+        added: "Iterable[tuple[int, int]]" = (),
+        removed: "Iterable[tuple[int, int]]" = (),
+        identity: object = None,
+    ):
+        """
+        Records elements added to or removed from a layer in the change feed, the occupancy map
+        and the code grids.
+        """
+        added = tuple(added)
+        removed = tuple(removed)
+        self.version += 1
+        self.occupancy.update(layer_name, added, removed)
+        self.code_grids.update(layer_name, added, removed)
+        # Autotiled neighbours of a changed tile are reformatted, so they must be redrawn too.
+        margin = 1 if self.tilemap.has_layer(layer_name) else 0
+        self.changes.record_elements(layer_name, added, removed, margin, identity)
+
+    def mark_changed(
+        self, layer_name: str, positions: "Iterable[tuple[int, int]]" = ()
+    ):
+        """
+        Records a change to elements that stay in place (tags, locked or unique flags...): bumps
+        the version and marks their cells dirty in the change feed. Call it inside `batch`.
+        """
+        self.version += 1
+        self.changes.record_dirty(layer_name, positions)
+
+    def conflicts_at(self, position: tuple[int, int], layer_name: str):
+        """Whether a layer concurrent with the given one has an element at the position."""
+        with self._read_occupancy() as occupancy:
+            return bool(occupancy.get(position) & occupancy.concurrent_mask(layer_name))
+
+    def is_cell_free(self, position: tuple[int, int], layer_name: str | None = None):
+        """
+        Whether an element of the layer can be placed at the position without replacing or
+        conflicting with another one. Without a layer name, checks that every layer is empty there.
+        """
+        with self._read_occupancy() as occupancy:
+            return not occupancy.get(position) & self._occupancy_mask(
+                occupancy, layer_name
+            )
+
+    def find_free_cell(
+        self, layer_name: str | None = None, start: tuple[int, int] = (0, 0)
+    ):
+        """Returns the first free cell for the layer in row-major order from `start`, or None."""
+        with self._read_occupancy() as occupancy:
+            return occupancy.find_free(
+                self._occupancy_mask(occupancy, layer_name), start
+            )
+
+    def free_cells(self, layer_name: str | None = None):
+        """Returns every free cell for the layer, row by row."""
+        with self._read_occupancy() as occupancy:
+            return occupancy.free_positions(self._occupancy_mask(occupancy, layer_name))
+
+    def extract_windows(
+        self,
+        positions: "Sequence[tuple[int, int]]",
+        size: int,
+        out=None,
+        pad: int = 0,
+        layer_names: "Sequence[str] | None" = None,
+        element_names: "dict[str, list[str]] | None" = None,
+    ):
+        """
+        Returns the `size` x `size` windows centred on each position for the given layers (all by
+        default), laid out as [position][layer][row][column] like `LevelSnapshot.extract_windows`.
+        Cells hold the layer's name codes from `code_grids` and `pad` outside the map. A name
+        keeps its code for the lifetime of the map; when `element_names` is given it receives the
+        names of each layer (code 1 is the first). The windows are copied straight out of the
+        incrementally updated code grids, and into `out` when given.
+        """
+        with self._read_up_to_date(self.code_grids) as code_grids:
+            names = layer_names or [layer.name for layer in self.layers]
+            if element_names is not None:
+                element_names.update(
+                    (name, list(code_grids.names.get(name, ()))) for name in names
+                )
+            return extract_windows(
+                [code_grids.cells[name] for name in names],
+                self.grid_size,
+                positions,
+                size,
+                out,
+                pad,
+            )
+
+    def extract_occupancy_window(
+        self, position: tuple[int, int], size: int, out=None, pad: int = 0
+    ):
+        """Returns the `size` x `size` occupancy window centred on the position. See `extract_occupancy_windows`."""
+        return self.extract_occupancy_windows([position], size, out, pad)
 
-            if self.world_objects_map.has_layer(layer_name):
-                self.add_layer(self.world_objects_map.get_layer(layer_name))
+    def extract_occupancy_windows(
+        self,
+        positions: "Sequence[tuple[int, int]]",
+        size: int,
+        out=None,
+        pad: int = 0,
+    ):
+        """
+        Returns the `size` x `size` windows of the occupancy map centred on each position, row
+        by row, one after the other. Each cell is a byte holding one bit per layer (bit i for
+        `layers[i]`, see `occupancy.layer_mask`), so a single window covers all layers. Cells
+        outside the map hold `pad`. Fills and returns `out` when given.
+        """
+        with self._read_occupancy() as occupancy:
+            return extract_windows(
+                [occupancy.cells], self.grid_size, positions, size, out, pad
+            )
+
+    def _read_occupancy(self):
+        return self._read_up_to_date(self.occupancy)
+
+    @contextmanager
+    def _read_up_to_date(self, cache: "OccupancyMap | CodeGrids"):
+        """
+        Yields the occupancy map or the code grids, up to date, while holding the read lock. A
+        stale cache is rebuilt under the write lock first. A thread that already holds only the
+        read lock can't take the write lock, so it gets a private copy built for the query instead.
+        """
+        read_only = self.lock.holds_read_only()
+        while True:
+            if not read_only and cache.is_stale:
+                with self.lock.write():
+                    if cache.is_stale:
+                        cache.rebuild()
+
+            with self.lock.read():
+                current = cache
+                if current.is_stale:
+                    if not read_only:
+                        # Invalidated again between the rebuild and the read.
+                        continue
+                    current = cache.private_copy()
+                    current.rebuild()
+                yield current
+                return
+
+    @staticmethod
+    def _occupancy_mask(occupancy: OccupancyMap, layer_name: str | None):
+        if layer_name is None:
+            return 0xFF
+        return occupancy.layer_mask(layer_name) | occupancy.concurrent_mask(layer_name)
+
+    def _record_resize(self, direction: "Direction", previous_size: tuple[int, int]):
+        width_change = self.grid_size[0] - previous_size[0]
+        height_change = self.grid_size[1] - previous_size[1]
+        self.occupancy.invalidate()
+        self.code_grids.invalidate()
+        self.version += 1
+        if width_change == 0 and height_change == 0:
+            return
+
+        # Only growing or shrinking from the left or the top moves the existing content.
+        self.changes.record_resize(
+            (
+                width_change if direction == "left" else 0,
+                height_change if direction == "top" else 0,
+            )
+        )
 
     def get_tilemap_layer(self, name: str):
         """Get a tilemap layer. Use this function if you want the tilemap layer type assigned to a variable."""
@@ -83,6 +346,17 @@ class MixedMap(GridMap):
         """Get a world objects layer. Use this function if you want the world objects layer type assigned to a variable."""
         return self.world_objects_map.get_layer(name)
 
+    def pack_layer(self, name: str):
+        """Returns a PackedGrid snapshot of the elements of a layer."""
+        layer = self.get_layer(name)
+        source = (
+            self.tilemap if self.tilemap.has_layer(name) else self.world_objects_map
+        )
+        return PackedGrid.from_elements(
+            self.grid_size,
+            (element for element in source.all_elements if element.layer is layer),
+        )
+
     def get_layer(self, name: str):
         """Get a layer by its name."""
         return cast("WorldObjectsLayer | EditorTilemapLayer", super().get_layer(name))
@@ -102,61 +376,48 @@ class MixedMap(GridMap):
         self.world_objects_map.grid_size = value
         self._grid_size = self.clamp_size(value)
 
+    @profiled("MixedMap.expand_towards")
     def expand_towards(self, direction, size=1, dynamic_resizing=False):
         # Unlock the previously locked edge if the map can be expanded in that direction.
         # It's done while dynamic resizing is disabled because in this scenario the edges
         # should be locked.
 
-        if not dynamic_resizing:
-            self.tilemap.unlock_edge_if_expandable(direction)
+        with self.batch():
+            previous_size = self.grid_size
+            if not dynamic_resizing:
+                self.tilemap.unlock_edge_if_expandable(direction)
 
-        new_positions = super().expand_towards(direction, size)
+            new_positions = super().expand_towards(direction, size)
+            self._record_resize(direction, previous_size)
 
-        if not new_positions:
-            return new_positions
+            if not new_positions:
+                return new_positions
 
-        self.tilemap.create_multiple_platforms_at(new_positions)
+            self.tilemap.create_multiple_platforms_at(new_positions)
 
-        # Locking the edge again.
-        if not dynamic_resizing:
-            self.tilemap.lock_all_edges()
+            # Locking the edge again.
+            if not dynamic_resizing:
+                self.tilemap.lock_all_edges()
 
-        return new_positions
+            return new_positions
 
     def multidirectional_expand_towards(self, directions: "list[Direction]", size: int):
         """Expands the map in multiple directions, distributing size per axis and prioritizing remainders."""
-        h_dirs = [d for d in directions if d in ("left", "right")]
-        v_dirs = [d for d in directions if d in ("top", "bottom")]
-
-        if h_dirs:
-            available_h = self.max_grid_size[0] - self.grid_size[0]
-            total_h_expand = min(available_h, len(h_dirs) * size)
-
-            h_size = total_h_expand // len(h_dirs)
-            h_rem = total_h_expand % len(h_dirs)
-
-            # Sort to process left before right, ensuring right gets the remainder
-            for direction in sorted(h_dirs):
-                expand_size = h_size
-                if h_rem > 0 and direction == "right":
-                    expand_size += h_rem
-                if expand_size > 0:
-                    self.expand_towards(direction, expand_size)
-
-        if v_dirs:
-            available_v = self.max_grid_size[1] - self.grid_size[1]
-            total_v_expand = min(available_v, len(v_dirs) * size)
-
-            v_size = total_v_expand // len(v_dirs)
-            v_rem = total_v_expand % len(v_dirs)
-
-            # Sort to process top before bottom, ensuring bottom gets the remainder
-            for direction in sorted(v_dirs, reverse=True):
-                expand_size = v_size
-                if v_rem > 0 and direction == "bottom":
-                    expand_size += v_rem
-                if expand_size > 0:
-                    self.expand_towards(direction, expand_size)
+        available = (
+            self.max_grid_size[0] - self.grid_size[0],
+            self.max_grid_size[1] - self.grid_size[1],
+        )
+        sizes = self._distribute_per_axis(directions, size, available)
+
+        width, height = self.grid_size
+        return self.resize_to(
+            (
+                -sizes.get("left", 0),
+                -sizes.get("top", 0),
+                width + sizes.get("right", 0),
+                height + sizes.get("bottom", 0),
+            )
+        )
 
     def _get_clamped_expansion_size(self, direction, size):
         if direction in ("right", "left"):
@@ -165,49 +426,146 @@ class MixedMap(GridMap):
             clamped_size = min(size, self.max_grid_size[1] - self.grid_size[1])
         return clamped_size
 
+    @profiled("MixedMap.reduce_towards")
     def reduce_towards(self, direction, size=1):
-        deleted_elements = super().reduce_towards(direction, size)
+        with self.batch():
+            previous_size = self.grid_size
+            deleted_elements = super().reduce_towards(direction, size)
+            self._record_resize(direction, previous_size)
 
-        self.tilemap.create_multiple_platforms_at(self.get_edge_positions(direction, 1))
-        self.tilemap.lock_edge(direction)
+            self.tilemap.create_multiple_platforms_at(
+                self.get_edge_positions(direction, 1)
+            )
+            self.tilemap.lock_edge(direction)
 
-        return deleted_elements
+            return deleted_elements
 
     def multidirectional_reduce_towards(self, directions: "list[Direction]", size: int):
         """Reduces the map from multiple directions, distributing size per axis and prioritizing remainders."""
-        h_dirs: "list[Direction]" = [d for d in directions if d in ("left", "right")]
-        v_dirs: "list[Direction]" = [d for d in directions if d in ("top", "bottom")]
-        abs_size = abs(size)
-
-        if h_dirs:
-            available_h = self.grid_size[0] - self.min_grid_size[0]
-            total_h_reduce = min(available_h, len(h_dirs) * abs_size)
-
-            h_size = total_h_reduce // len(h_dirs)
-            h_rem = total_h_reduce % len(h_dirs)
-
-            # Sort to process left before right, ensuring right gets the remainder
-            for direction in sorted(h_dirs):
-                reduce_size = h_size
-                if h_rem > 0 and direction == "right":
-                    reduce_size += h_rem
-                if reduce_size > 0:
-                    self.reduce_towards(direction, reduce_size)
-
-        if v_dirs:
-            available_v = self.grid_size[1] - self.min_grid_size[1]
-            total_v_reduce = min(available_v, len(v_dirs) * abs_size)
-
-            v_size = total_v_reduce // len(v_dirs)
-            v_rem = total_v_reduce % len(v_dirs)
-
-            # Sort to process top before bottom, ensuring bottom gets the remainder
-            for direction in sorted(v_dirs, reverse=True):
-                reduce_size = v_size
-                if v_rem > 0 and direction == "bottom":
-                    reduce_size += v_rem
-                if reduce_size > 0:
-                    self.reduce_towards(direction, reduce_size)
+        available = (
+            self.grid_size[0] - self.min_grid_size[0],
+            self.grid_size[1] - self.min_grid_size[1],
+        )
+        sizes = self._distribute_per_axis(directions, abs(size), available)
+
+        width, height = self.grid_size
+        return self.resize_to(
+            (
+                sizes.get("left", 0),
+                sizes.get("top", 0),
+                width - sizes.get("right", 0),
+                height - sizes.get("bottom", 0),
+            )
+        )
+
+    @staticmethod
+    def _distribute_per_axis(
+        directions: "list[Direction]", size: int, available: tuple[int, int]
+    ):
+        """
+        Splits the size among the given directions of each axis, limited by the room available on
+        that axis. The remainder of an uneven split goes to the right or bottom edge.
+        """
+        sizes: dict[str, int] = {}
+        for axis_directions, axis_available in (
+            ([d for d in ("left", "right") if d in directions], available[0]),
+            ([d for d in ("top", "bottom") if d in directions], available[1]),
+        ):
+            if not axis_directions:
+                continue
+            total = min(axis_available, len(axis_directions) * size)
+            share, remainder = divmod(total, len(axis_directions))
+            for direction in axis_directions:
+                sizes[direction] = share
+            sizes[axis_directions[-1]] += remainder
+        return sizes
+
+    @profiled("MixedMap.resize_to")
+    def resize_to(self, rect: tuple[int, int, int, int]):
+        """
+        Resizes the map in a single pass so that it covers `rect`, given as (left, top, right,
+        bottom) in the current cell coordinates, with right and bottom exclusive. Negative left or
+        top values expand the map towards those edges. Every layer is shifted once per resized
+        edge, and the new border is filled with platforms and formatted in a single bulk pass,
+        followed by one edge locking pass. Sizes are clamped to the map limits.
+        Returns the elements deleted by the reduction.
+        """
+        left, top, right, bottom = rect
+        width, height = self.grid_size
+        changes: "dict[Direction, int]" = {
+            "left": -left,
+            "right": right - width,
+            "top": -top,
+            "bottom": bottom - height,
+        }
+
+        deleted_elements = []
+        reduced: "list[Direction]" = []
+        expanded: "dict[Direction, int]" = {}
+
+        with self.batch():
+            for direction, change in changes.items():
+                if change >= 0:
+                    continue
+                size = self._get_clamped_reduction_size(direction, -change)
+                if size <= 0:
+                    continue
+                previous_size = self.grid_size
+                deleted_elements.extend(super().reduce_towards(direction, size) or ())
+                self._record_resize(direction, previous_size)
+                reduced.append(direction)
+
+            for direction, change in changes.items():
+                if change <= 0:
+                    continue
+                size = self._get_clamped_expansion_size(direction, change)
+                if size <= 0:
+                    continue
+                self.tilemap.unlock_edge_if_expandable(direction)
+                previous_size = self.grid_size
+                super().expand_towards(direction, size)
+                self._record_resize(direction, previous_size)
+                expanded[direction] = size
+
+            border = self._get_border_band(expanded, reduced)
+            if border:
+                self.tilemap.create_multiple_platforms_at(border)
+
+            if expanded:
+                self.tilemap.lock_all_edges()
+            else:
+                for direction in reduced:
+                    self.tilemap.lock_edge(direction)
+
+        return deleted_elements
+
+    def _get_border_band(
+        self, expanded: "dict[Direction, int]", reduced: "list[Direction]"
+    ):
+        """
+        Returns, without duplicates, the positions of the strips added by the expansions and of
+        the edges uncovered by the reductions, in the final coordinates of the map.
+        """
+        width, height = self.grid_size
+        bands = dict(expanded)
+        for direction in reduced:
+            bands[direction] = max(bands.get(direction, 0), 1)
+
+        positions: dict[tuple[int, int], None] = {}
+        for direction, size in bands.items():
+            if direction == "left":
+                xs, ys = range(0, size), range(height)
+            elif direction == "right":
+                xs, ys = range(width - size, width), range(height)
+            elif direction == "top":
+                xs, ys = range(width), range(0, size)
+            else:
+                xs, ys = range(width), range(height - size, height)
+            for x in xs:
+                for y in ys:
+                    positions[(x, y)] = None
+
+        return list(positions)
 
     def _get_clamped_reduction_size(self, direction, size):
         if direction in ("right", "left"):
@@ -216,3 +574,8 @@ class MixedMap(GridMap):
             clamped_size = min(size, self.grid_size[1] - self.min_grid_size[1])
 
         return clamped_size
+
+
+# `from_dict` goes through pytiling's deserializers for the layers and elements, so they are
+# registered as soon as the map class is available, whichever package import brought it in.
+initialize_level_deserializers()
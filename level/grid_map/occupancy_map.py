@@ -0,0 +1,130 @@
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from .mixed_map import MixedMap
+
+Position = tuple[int, int]
+
+
+class OccupancyMap:
+    """
+    One byte per cell of a MixedMap, holding one bit per layer (in layer order) that has an
+    element in the cell. Layer concurrences become bit masks, so checking a cell against every
+    concurrent layer is a single lookup and free cells are found with a byte search over the
+    whole grid. The bitmap is kept up to date through the map's change notifications and
+    invalidated by resizes and layer changes. The queries don't rebuild it: the MixedMap rebuilds
+    a stale bitmap under its write lock before reading it (see `MixedMap._read_occupancy`).
+    """
+
+    def __init__(self, mixed_map: "MixedMap"):
+        self._mixed_map = mixed_map
+        self.cells: bytearray | None = None
+        self.width = 0
+        self.height = 0
+        self._bits: dict[str, int] = {}
+        self._free_tables: dict[int, bytes] = {}
+
+    def invalidate(self):
+        self.cells = None
+
+    @property
+    def is_stale(self):
+        """Whether the bitmap must be rebuilt before being queried."""
+        return (
+            self.cells is None or (self.width, self.height) != self._mixed_map.grid_size
+        )
+
+    def private_copy(self):
+        """Returns an unbuilt bitmap sharing no state with this one."""
+        return OccupancyMap(self._mixed_map)
+
+    def rebuild(self):
+        mixed_map = self._mixed_map
+        layers = mixed_map.layers
+        if len(layers) > 8:
+            raise ValueError("The occupancy map supports up to 8 layers.")
+
+        self._bits = {layer.name: 1 << index for index, layer in enumerate(layers)}
+        self.width, self.height = mixed_map.grid_size
+        cells = bytearray(self.width * self.height)
+        for source in (mixed_map.tilemap, mixed_map.world_objects_map):
+            for element in source.all_elements:
+                bit = self._bits.get(element.layer.name)
+                if bit is not None:
+                    x, y = element.position
+                    cells[y * self.width + x] |= bit
+        self.cells = cells
+
+    def update(
+        self,
+        layer_name: str,
+        added: Iterable[Position] = (),
+        removed: Iterable[Position] = (),
+    ):
+        """Applies element additions and removals of a layer to the bitmap, if it was built."""
+        if self.cells is None:
+            return
+        bit = self._bits.get(layer_name)
+        if bit is None or (self.width, self.height) != self._mixed_map.grid_size:
+            self.invalidate()
+            return
+
+        cells = self.cells
+        width = self.width
+        for x, y in added:
+            cells[y * width + x] |= bit
+        for x, y in removed:
+            cells[y * width + x] &= ~bit & 0xFF
+
+    def layer_mask(self, *layer_names: str):
+        mask = 0
+        for name in layer_names:
+            mask |= self._bits.get(name, 0)
+        return mask
+
+    def concurrent_mask(self, layer_name: str):
+        """Returns the mask of the layers concurrent with the layer, the layer itself excluded."""
+        names = {
+            name
+            for concurrence in self._mixed_map.layer_concurrences
+            if layer_name in concurrence
+            for name in concurrence
+            if name != layer_name
+        }
+        return self.layer_mask(*names)
+
+    def get(self, position: Position):
+        """Returns the layer bits of the cell, or 0 if the position is outside the map."""
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return self.cells[y * self.width + x]
+
+    def find_free(self, mask: int, start: Position = (0, 0)) -> Position | None:
+        """
+        Returns the first cell, in row-major order from `start`, with none of the mask bits set.
+        """
+        index = self._free_view(mask).find(0, start[1] * self.width + start[0])
+        if index == -1:
+            return None
+        return (index % self.width, index // self.width)
+
+    def free_positions(self, mask: int) -> list[Position]:
+        """Returns every cell with none of the mask bits set, row by row."""
+        free = self._free_view(mask)
+        width = self.width
+        positions = []
+        index = free.find(0)
+        while index != -1:
+            positions.append((index % width, index // width))
+            index = free.find(0, index + 1)
+        return positions
+
+    def _free_view(self, mask: int):
+        """Returns a copy of the cells with 0 where no mask bit is set and 1 elsewhere."""
+        table = self._free_tables.get(mask)
+        if table is None:
+            table = self._free_tables[mask] = bytes(
+                1 if value & mask else 0 for value in range(256)
+            )
+        return self.cells.translate(table)
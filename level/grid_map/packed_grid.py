@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from pytiling import GridElement
+
+
+class PackedGrid:
+    """
+    Row-major byte array of the elements of a layer. Empty cells hold 0 and occupied cells hold
+    1 + the index of the element's name in `names`, so whole rows can be compared, copied or
+    shared as plain bytes.
+    """
+
+    __slots__ = ("width", "height", "cells", "names")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cells: bytearray | None = None,
+        names: list[str] | None = None,
+    ):
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else bytearray(width * height)
+        self.names = names if names is not None else []
+
+    @classmethod
+    def from_elements(
+        cls, grid_size: tuple[int, int], elements: Iterable["GridElement"]
+    ):
+        width, height = grid_size
+        instance = cls(width, height)
+        codes: dict[str, int] = {}
+        cells = instance.cells
+
+        for element in elements:
+            code = codes.get(element.name)
+            if code is None:
+                if len(instance.names) == 255:
+                    raise ValueError("A packed grid supports up to 255 element names.")
+                instance.names.append(element.name)
+                code = codes[element.name] = len(instance.names)
+            x, y = element.position
+            cells[y * width + x] = code
+
+        return instance
+
+    @property
+    def grid_size(self):
+        return (self.width, self.height)
+
+    def get(self, position: tuple[int, int]):
+        """Returns the name of the element at the position, or None if the cell is empty."""
+        x, y = position
+        code = self.cells[y * self.width + x]
+        return self.names[code - 1] if code else None
+
+    def is_occupied(self, position: tuple[int, int]):
+        x, y = position
+        return self.cells[y * self.width + x] != 0
+
+    def row(self, y: int):
+        return memoryview(self.cells)[y * self.width : (y + 1) * self.width]
+
+    def occupied_count(self):
+        return len(self.cells) - self.cells.count(0)
+
+    def positions(self):
+        """Returns the positions of every occupied cell, row by row."""
+        width = self.width
+        return [
+            (index % width, index // width)
+            for index, code in enumerate(self.cells)
+            if code
+        ]
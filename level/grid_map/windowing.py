@@ -0,0 +1,63 @@
+from typing import Sequence
+
+Position = tuple[int, int]
+
+
+def extract_windows(
+    layers: Sequence,
+    grid_size: tuple[int, int],
+    positions: Sequence[Position],
+    size: int,
+    out=None,
+    pad: int = 0,
+):
+    """
+    Copies the `size` x `size` windows centred on each position out of row-major byte grids (a
+    PackedGrid's cells, an occupancy bitmap, a shared memory view...), one grid per layer.
+    The result is laid out as [position][layer][row][column], one byte per cell, and cells
+    outside the map hold `pad`. Windows are copied a row slice at a time. When `out` is given
+    (a bytearray, a C-contiguous uint8 numpy array...), it is filled in place and returned, so
+    no buffer is allocated; otherwise a new bytearray is returned.
+    """
+    width, height = grid_size
+    window_area = size * size
+    total = len(positions) * len(layers) * window_area
+    if out is None:
+        out = bytearray(total)
+    target = memoryview(out).cast("B")
+    if len(target) < total:
+        raise ValueError(
+            f"The output buffer holds {len(target)} bytes, {total} needed."
+        )
+
+    sources = [memoryview(layer).cast("B") for layer in layers]
+    half = size // 2
+    padding = None
+
+    for index, (x, y) in enumerate(positions):
+        left = x - half
+        top = y - half
+        first_column = max(left, 0)
+        last_column = min(left + size, width)
+        rows = range(max(top, 0), min(top + size, height))
+        inside = (
+            left >= 0 and top >= 0 and left + size <= width and top + size <= height
+        )
+        if not inside and padding is None:
+            padding = bytes([pad]) * window_area
+
+        for layer_index, source in enumerate(sources):
+            base = (index * len(sources) + layer_index) * window_area
+            if not inside:
+                target[base : base + window_area] = padding
+            if first_column >= last_column:
+                continue
+            length = last_column - first_column
+            for row in rows:
+                start = base + (row - top) * size + first_column - left
+                source_start = row * width + first_column
+                target[start : start + length] = source[
+                    source_start : source_start + length
+                ]
+
+    return out
@@ -1,3 +1,4 @@
 from .world_object_representation import WorldObjectRepresentation
+from .world_object_arrays import WorldObjectArrays, WorldObjectRow
 
-__all__ = ["WorldObjectRepresentation"]
+__all__ = ["WorldObjectRepresentation", "WorldObjectArrays", "WorldObjectRow"]
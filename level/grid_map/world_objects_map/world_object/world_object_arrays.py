@@ -0,0 +1,115 @@
+from array import array
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+if TYPE_CHECKING:
+    from .world_object_representation import WorldObjectRepresentation
+
+LOCKED_FLAG = 1
+UNIQUE_FLAG = 2
+
+
+class WorldObjectRow(NamedTuple):
+    """Lightweight read-only view of one world object stored in a WorldObjectArrays."""
+
+    position: tuple[int, int]
+    name: str
+    tags: tuple[str, ...]
+    locked: bool
+    unique: bool
+
+
+class WorldObjectArrays:
+    """
+    Struct-of-arrays snapshot of world objects: positions, name ids, tag set ids and flags are kept
+    in compact typed arrays, with names and tag tuples stored once in lookup tables. Iterating or
+    serializing it doesn't touch the world object instances.
+    """
+
+    __slots__ = ("xs", "ys", "name_ids", "tags_ids", "flags", "names", "tag_sets")
+
+    def __init__(self):
+        self.xs = array("H")
+        self.ys = array("H")
+        self.name_ids = array("H")
+        self.tags_ids = array("H")
+        self.flags = array("B")
+        self.names: list[str] = []
+        self.tag_sets: list[tuple[str, ...]] = []
+
+    @classmethod
+    def from_objects(cls, world_objects: Iterable["WorldObjectRepresentation"]):
+        instance = cls()
+        name_ids: dict[str, int] = {}
+        tags_ids: dict[tuple[str, ...], int] = {}
+
+        for world_object in world_objects:
+            x, y = world_object.position
+            instance.xs.append(x)
+            instance.ys.append(y)
+
+            name_id = name_ids.get(world_object.name)
+            if name_id is None:
+                name_id = name_ids[world_object.name] = len(instance.names)
+                instance.names.append(world_object.name)
+            instance.name_ids.append(name_id)
+
+            tags_id = tags_ids.get(world_object.tags)
+            if tags_id is None:
+                tags_id = tags_ids[world_object.tags] = len(instance.tag_sets)
+                instance.tag_sets.append(world_object.tags)
+            instance.tags_ids.append(tags_id)
+
+            instance.flags.append(
+                (LOCKED_FLAG if world_object.locked else 0)
+                | (UNIQUE_FLAG if world_object.unique else 0)
+            )
+
+        return instance
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index: int):
+        flags = self.flags[index]
+        return WorldObjectRow(
+            (self.xs[index], self.ys[index]),
+            self.names[self.name_ids[index]],
+            self.tag_sets[self.tags_ids[index]],
+            bool(flags & LOCKED_FLAG),
+            bool(flags & UNIQUE_FLAG),
+        )
+
+    def __iter__(self):
+        for index in range(len(self.xs)):
+            yield self[index]
+
+    def positions(self):
+        return list(zip(self.xs, self.ys))
+
+    def positions_of(self, name: str):
+        """Returns the positions of every object with the given name."""
+        if name not in self.names:
+            return []
+        name_id = self.names.index(name)
+        return [
+            (x, y)
+            for x, y, object_name_id in zip(self.xs, self.ys, self.name_ids)
+            if object_name_id == name_id
+        ]
+
+    def to_dicts(self):
+        """Serializes the objects the same way WorldObjectRepresentation.to_dict does."""
+        sorted_tag_sets = [sorted(tags) for tags in self.tag_sets]
+        return [
+            {
+                "__class__": "WorldObjectRepresentation",
+                "position": (x, y),
+                "name": self.names[name_id],
+                "locked": bool(flags & LOCKED_FLAG),
+                "unique": bool(flags & UNIQUE_FLAG),
+                "tags": list(sorted_tag_sets[tags_id]),
+            }
+            for x, y, name_id, tags_id, flags in zip(
+                self.xs, self.ys, self.name_ids, self.tags_ids, self.flags
+            )
+        ]
@@ -1,18 +1,37 @@
 from pytiling import GridElement
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
+import sys
 
 if TYPE_CHECKING:
     from pytiling import GridLayer
 
+_interned_tag_tuples: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def intern_tags(tags: Iterable[str]) -> tuple[str, ...]:
+    """
+    Returns a shared, sorted tuple of the distinct tags. Objects with the same tags reference the
+    same tuple of interned strings, so tags cost no memory per object and can't be mutated from
+    the outside. The table holds one entry per distinct tag set, whatever order tags come in.
+    """
+    key = tuple(sorted(set(tags)))
+    interned = _interned_tag_tuples.get(key)
+    if interned is None:
+        interned = _interned_tag_tuples[key] = tuple(sys.intern(tag) for tag in key)
+    return interned
+
 
 class WorldObjectRepresentation(GridElement):
     """A representation of a world object (parent of game entities). Its name should be the same as the canvas object that represents it."""
 
+    _locked = False
+    _unique = False
+
     def __init__(
-        self, position: tuple[int, int], name: str, tags: list[str] = [], **args
+        self, position: tuple[int, int], name: str, tags: Iterable[str] = (), **args
     ):
-        super().__init__(position, name, **args)
-        self.tags = tags
+        super().__init__(position, sys.intern(name), **args)
+        self._tags = intern_tags(tags)
 
     def to_dict(self):
         """Serialize the world object representation to a dictionary."""
@@ -22,7 +41,7 @@ class WorldObjectRepresentation(GridElement):
             "name": self.name,
             "locked": self.locked,
             "unique": self.unique,
-            "tags": sorted(self.tags),
+            "tags": sorted(self._tags),
         }
 
     @classmethod
@@ -31,7 +50,7 @@ class WorldObjectRepresentation(GridElement):
         instance = cls(
             position=tuple(data["position"]),
             name=data["name"],
-            tags=data.get("tags", []),
+            tags=data.get("tags", ()),
         )
         instance.locked = data.get("locked", False)
         instance.unique = data.get("unique", False)
@@ -45,13 +64,51 @@ class WorldObjectRepresentation(GridElement):
     def layer(self, layer: "GridLayer"):
         self._layer = layer
 
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @locked.setter
+    def locked(self, value: bool):
+        self._set_attribute("_locked", value)
+
+    @property
+    def unique(self) -> bool:
+        return self._unique
+
+    @unique.setter
+    def unique(self, value: bool):
+        self._set_attribute("_unique", value)
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Iterable[str]):
+        self._set_attribute("_tags", intern_tags(value))
+
     def add_tag(self, tag: str):
-        self.tags.append(tag)
+        self._set_attribute("_tags", intern_tags(self._tags + (tag,)))
+
+    def _set_attribute(self, attribute: str, value):
+        """
+        Sets an attribute under the write lock of the MixedMap the object is in, if any, and
+        reports the change so cached snapshots and renderers pick it up.
+        """
+        layer = getattr(self, "_layer", None)
+        mixed_map = getattr(layer, "mixed_map", None)
+        if mixed_map is None:
+            setattr(self, attribute, value)
+            return
+        with mixed_map.batch():
+            setattr(self, attribute, value)
+            mixed_map.mark_changed(layer.name, (self.position,))
 
     @property
     def canvas_object_name(self):
         variation_tag = next(
-            (tag for tag in self.tags if tag.startswith("variation_")), None
+            (tag for tag in self._tags if tag.startswith("variation_")), None
         )
         if not variation_tag:
             return self.name
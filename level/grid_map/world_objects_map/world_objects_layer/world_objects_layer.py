@@ -1,11 +1,18 @@
 from pytiling import GridLayer
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 from ..world_object import WorldObjectRepresentation
 
+if TYPE_CHECKING:
+    from ...mixed_map import MixedMap
+
 
 class WorldObjectsLayer(GridLayer):
     def __init__(self, name: str, icon_path: str):
         super().__init__(name)
         self.icon_path = icon_path
+        # Set by the MixedMap the layer is populated into, to report element changes to it.
+        self.mixed_map: "MixedMap | None" = None
 
     def to_dict(self):
         """Serialize the layer to a dictionary with asset-relative paths."""
@@ -18,5 +25,76 @@ class WorldObjectsLayer(GridLayer):
 
     def create_world_object_at(self, position: tuple[int, int], name: str, **args):
         world_object = WorldObjectRepresentation(position, name, **args)
-        self.add_element(world_object)
+        # The occupancy map answers concurrence conflicts without asking every concurrent layer.
+        if self.mixed_map is None or not self.mixed_map.conflicts_at(
+            position, self.name
+        ):
+            self.add_element(world_object)
         return world_object
+
+    def add_element(self, element, *args, **kwargs):
+        if self.mixed_map is None:
+            return super().add_element(element, *args, **kwargs)
+
+        position = element.position
+        with self._batch():
+            # Adding an element can remove others without going through `remove_element`: the
+            # element it replaces in its cell and the previous instance of a unique object.
+            in_place = self.get_element_at(position)
+            was_present = in_place is element
+            candidates = [in_place] if in_place is not None else []
+            if element.unique:
+                candidates.extend(self._unique_instances(element.name))
+            replaced = {
+                id(world_object): (
+                    world_object,
+                    world_object.layer,
+                    world_object.position,
+                )
+                for world_object in candidates
+                if world_object is not element
+            }
+
+            result = super().add_element(element, *args, **kwargs)
+
+            for world_object, layer, previous_position in replaced.values():
+                if layer.get_element_at(previous_position) is not world_object:
+                    self.mixed_map.notify_elements_changed(
+                        layer.name, removed=(previous_position,), identity=world_object
+                    )
+            # The element may be rejected (e.g. by a layer concurrence), so only report it if it landed.
+            if not was_present and self.get_element_at(position) is element:
+                self.mixed_map.notify_elements_changed(
+                    self.name, added=(position,), identity=element
+                )
+        return result
+
+    def remove_element(self, element, *args, **kwargs):
+        position = element.position
+        with self._batch():
+            # Only an element that was in the layer, and is gone from it now, counts as removed.
+            was_present = self.get_element_at(position) is element
+            result = super().remove_element(element, *args, **kwargs)
+            if (
+                self.mixed_map is not None
+                and was_present
+                and self.get_element_at(position) is not element
+            ):
+                self.mixed_map.notify_elements_changed(
+                    self.name, removed=(position,), identity=element
+                )
+        return result
+
+    def _unique_instances(self, name: str):
+        """Returns the unique world objects of the map with the given name."""
+        return [
+            world_object
+            for world_object in self.mixed_map.world_objects_map.all_world_objects
+            if world_object.unique and world_object.name == name
+        ]
+
+    def _batch(self):
+        """Holds the MixedMap's write lock and groups its change notifications, if attached to one."""
+        if self.mixed_map is None:
+            return nullcontext()
+        return self.mixed_map.batch()
@@ -1,5 +1,6 @@
 from pytiling import GridMap
 from typing import TYPE_CHECKING, cast
+from .world_object import WorldObjectArrays
 
 if TYPE_CHECKING:
     from .world_objects_layer import WorldObjectsLayer
@@ -42,6 +43,14 @@ class WorldObjectsMap(GridMap):
     def all_world_objects(self):
         return cast(list["WorldObjectRepresentation"], self.all_elements)
 
+    def layer_arrays(self, name: str):
+        """Returns a struct-of-arrays snapshot of the world objects in the given layer."""
+        return WorldObjectArrays.from_objects(
+            world_object
+            for world_object in self.all_world_objects
+            if world_object.layer.name == name
+        )
+
     @property
     def mixed_map(self):
         if self._mixed_map is None:
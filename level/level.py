@@ -5,10 +5,26 @@ import copy
 from pytiling.serialization import map_from_dict
 from pathlib import Path
 from .config import LEVEL_SAVE_FOLDER_PATH
-from typing import TYPE_CHECKING, cast
+from .compression import (
+    read_level_data,
+    remove_other_variants,
+    with_codec_suffix,
+    write_level_data,
+)
+from .profiling import profiled
+from .background_io import get_save_queue
+from .level_diff import diff_levels
+from .level_snapshot import LevelSnapshot
+from . import serialization
+from typing import TYPE_CHECKING, Callable, cast
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from .grid_map import MixedMap
+    from .compression import Codec
+
+# `Level.from_dict` deserializes the map through pytiling, which needs the level classes.
+serialization.initialize_level_deserializers()
 
 
 class Level:
@@ -22,6 +38,7 @@ class Level:
         self.toggler = LevelToggler()
 
         self._name = "My custom level"
+        self._snapshot: LevelSnapshot | None = None
 
     @property
     def name(self):
@@ -31,6 +48,18 @@ class Level:
     def name(self, value):
         self._name = value
 
+    def __reduce__(self):
+        """
+        Pickles the level as a compact state (packed tile grids, tilesets by asset path, no UI
+        state), which keeps it cheap to send to other processes, with pickle or dill.
+        `copy.copy` and `copy.deepcopy` go through the same state, so a copy is always a deep,
+        rebuilt level: it starts with a fresh toggler and has no change feed subscribers.
+        """
+        from .level_pickling import level_state, restore_level
+
+        with self.map.lock.read():
+            return (restore_level, (level_state(self),))
+
     def to_dict(self):
         return {
             "_name": self._name,
@@ -44,6 +73,7 @@ class Level:
         instance.name = data["_name"]
         return instance
 
+    @profiled("Level.to_hash")
     def to_hash(self):
         """Generate a hash representation of the level."""
         """
@@ -53,41 +83,44 @@ class Level:
         display-only properties (like 'icon_path' or a potential 'display' key)
         to ensure the hash only changes when gameplay-relevant data changes.
         """
-        level_dict = self.to_dict()
-
-        dict_for_hash = copy.deepcopy(level_dict)
-
-        def _clean_dict_for_hash(d):
-            """Recursively remove display-only keys from the dictionary."""
-            if isinstance(d, dict):
-                # As per the request, we filter out 'display' properties.
-                # 'icon_path' is another such property found on layers.
-                keys_to_remove = ["display", "icon_path"]
-                for key in keys_to_remove:
-                    d.pop(key, None)
-
-                for value in d.values():
-                    _clean_dict_for_hash(value)
-            elif isinstance(d, list):
-                for item in d:
-                    _clean_dict_for_hash(item)
-
-        _clean_dict_for_hash(dict_for_hash)
+        with self.map.lock.read():
+            level_dict = self.to_dict()
+        return hash_level_data(level_dict)
 
-        # Serialize to a compact, sorted JSON string to ensure determinism.
-        deterministic_json = json.dumps(
-            dict_for_hash, sort_keys=True, separators=(",", ":")
-        )
-
-        hasher = hashlib.sha256()
-        hasher.update(deterministic_json.encode("utf-8"))
-
-        return hasher.hexdigest()
+    def snapshot(self):
+        """
+        Returns an immutable snapshot of the level, consistent even while another thread edits
+        it. It is rebuilt, under the map's read lock, only when the map version or the name
+        changed since the last call.
+        """
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == self.map.version
+            and snapshot.name == self.name
+        ):
+            return snapshot
+
+        with self.map.lock.read():
+            snapshot = self._snapshot = LevelSnapshot.from_level(self)
+        return snapshot
+
+    def diff(self, other: "Level"):
+        """
+        Returns the structural differences between this level and another one (tiles added and
+        removed per layer, world objects added, removed and moved, tag changes and the resize
+        offset), ignoring display-only data.
+        """
+        return diff_levels(self, other)
 
     @staticmethod
-    def load(filepath: str):
-        with open(filepath, "r") as file:
-            data = json.load(file)
+    @profiled("Level.load")
+    def load(filepath: str | Path, codec: "Codec | None" = None):
+        """
+        Loads a level from a file. The codec is inferred from the file extension
+        (e.g. 'level.json.xz') unless it is given explicitly.
+        """
+        data = read_level_data(filepath, codec)
         level = Level.from_dict(data)
         return level
 
@@ -102,7 +135,47 @@ class Level:
     def same_name_saved(self):
         return self.save_file_path.parent.is_dir() if self.save_file_path else None
 
-    def save(self, custom_path: Path | str | None = None):
+    @profiled("Level.save")
+    def save(self, custom_path: Path | str | None = None, codec: "Codec | None" = None):
+        """
+        Saves the level and returns the path written to. If a codec is given, the path gets that
+        codec's extension (e.g. 'level.json.zst'); otherwise the codec is inferred from the path.
+        Copies of the file saved with other codecs are deleted.
+        """
+        path = self._resolve_save_path(custom_path, codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.map.lock.read():
+            data = self.to_dict()
+        write_level_data(data, path)
+        # A previous save with another codec would otherwise shadow this one when loading.
+        remove_other_variants(path)
+        return path
+
+    def save_async(
+        self,
+        custom_path: Path | str | None = None,
+        codec: "Codec | None" = None,
+        callback: "Callable[[Future[Path]], None] | None" = None,
+    ) -> "Future[Path]":
+        """
+        Saves the level on a background thread and returns a future resolving to the written path.
+        The level is snapshotted to a dictionary on the calling thread, so it can be edited right
+        after this returns. Saves to the same path that pile up before the worker reaches them are
+        coalesced into one write. The callback runs on the worker thread; use
+        `asyncio.wrap_future` to await the future from an event loop.
+        """
+        path = self._resolve_save_path(custom_path, codec)
+        with self.map.lock.read():
+            data = self.to_dict()
+        future = get_save_queue().submit(data, path)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def _resolve_save_path(
+        self, custom_path: Path | str | None, codec: "Codec | None"
+    ) -> Path:
         if not custom_path and not self.save_file_path:
             raise ValueError("Save file path is not set for the level.")
 
@@ -110,10 +183,9 @@ class Level:
             custom_path = Path(custom_path)
 
         path = custom_path or self.save_file_path
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(path, "w") as file:
-            json.dump(self.to_dict(), file, indent=2, sort_keys=True)
+        if codec is not None:
+            path = with_codec_suffix(path, codec)
+        return path
 
     @property
     def issues(self):
@@ -129,3 +201,38 @@ class Level:
             issues.append("The goal needs to be placed on the level.")
 
         return issues
+
+
+def hash_level_data(data: dict):
+    """
+    Hashes a level dictionary, as returned by `Level.to_dict` or read from a level file, so a
+    saved level can be hashed without building it. See `Level.to_hash`.
+    """
+
+    def _clean_dict_for_hash(d):
+        """Recursively remove display-only keys from the dictionary."""
+        if isinstance(d, dict):
+            # As per the request, we filter out 'display' properties.
+            # 'icon_path' is another such property found on layers.
+            keys_to_remove = ["display", "icon_path"]
+            for key in keys_to_remove:
+                d.pop(key, None)
+
+            for value in d.values():
+                _clean_dict_for_hash(value)
+        elif isinstance(d, list):
+            for item in d:
+                _clean_dict_for_hash(item)
+
+    dict_for_hash = copy.deepcopy(data)
+    _clean_dict_for_hash(dict_for_hash)
+
+    # Serialize to a compact, sorted JSON string to ensure determinism.
+    deterministic_json = json.dumps(
+        dict_for_hash, sort_keys=True, separators=(",", ":")
+    )
+
+    hasher = hashlib.sha256()
+    hasher.update(deterministic_json.encode("utf-8"))
+
+    return hasher.hexdigest()
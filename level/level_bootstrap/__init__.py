@@ -1,3 +1,4 @@
 from .level_loader import LevelLoader
+from .level_cache import LevelCache
 
-__all__ = ["LevelLoader"]
+__all__ = ["LevelLoader", "LevelCache"]
@@ -4,6 +4,7 @@ from ..grid_map.world_objects_map import WorldObjectsLayer
 from ..grid_map import MixedMap
 from ..level import Level
 from level.config import *
+from level.profiling import profiled, count_formatted_tiles
 
 MAP_SIZE = (START_MAP_WIDTH, START_MAP_HEIGHT)
 TILE_SIZE = (TILE_WIDTH, TILE_HEIGHT)
@@ -11,6 +12,7 @@ TILE_SIZE = (TILE_WIDTH, TILE_HEIGHT)
 
 class LevelFactory:
 
+    @profiled("LevelFactory.create_level")
     def create_level(self):
 
         mixed_map = MixedMap(TILE_SIZE, MAP_SIZE, MIN_GRID_SIZE, MAX_GRID_SIZE)
@@ -43,10 +45,12 @@ class LevelFactory:
                 self.tilemap.add_layer(layers[layer_name])
 
     def _create_starting_tiles(self):
-        for position in self.tilemap.get_edge_positions():
+        positions = list(self.tilemap.get_edge_positions())
+        for position in positions:
             self.tilemap.create_basic_platform_at(position, apply_formatting=False)
 
         self.tilemap.format_all_tiles()
+        count_formatted_tiles(len(positions))
 
     def _configure_world_objects_map(self):
         essentials = WorldObjectsLayer(
@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from ..profiling import profiled
+
+if TYPE_CHECKING:
+    from ..compression import Codec
+    from ..level import Level
+
+
+class _CacheEntry:
+    __slots__ = ("stamp", "state", "size")
+
+    def __init__(self, stamp: tuple[int, int], state: tuple, size: int):
+        self.stamp = stamp
+        self.state = state
+        self.size = size
+
+
+class LevelCache:
+    """
+    Bounded LRU cache of loaded level files, keyed by resolved path and validated against the
+    file's modification time and size. Entries hold the compact state of the level (see
+    `level_pickling.level_state`) rather than the parsed JSON: every `get` restores a new Level
+    from it, which skips parsing and deserializing the file, and callers can't corrupt the cached
+    state. Misses return a level restored from the freshly cached state too, so a level is the
+    same whether it came from the cache or not. Entries are evicted, least recently used first, when either the entry count or the
+    estimated memory budget is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries: OrderedDict[Path, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @profiled("LevelCache.get")
+    def get(self, file_path: str | Path, codec: "Codec | None" = None) -> "Level":
+        """Returns a new Level for the file, reading and building it only if the file changed."""
+        from ..level import Level
+        from ..level_pickling import level_state, restore_level
+
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                state = entry.state
+            else:
+                state = None
+                self.misses += 1
+        if state is not None:
+            return restore_level(state)
+
+        level = Level.load(path, codec)
+        state = level_state(level)
+        size = _estimate_size(state)
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.current_bytes -= previous.size
+            if size <= self.max_bytes:
+                self._entries[path] = _CacheEntry(stamp, state, size)
+                self.current_bytes += size
+                self._evict()
+
+        # A miss returns a level restored from the state as well, so hits and misses always give
+        # equivalent levels.
+        return restore_level(state)
+
+    def invalidate(self, file_path: str | Path):
+        with self._lock:
+            entry = self._entries.pop(Path(file_path).resolve(), None)
+            if entry is not None:
+                self.current_bytes -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    @property
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.evictions += 1
+
+
+# Rough per-item sizes used to estimate the memory held by a cached level state.
+_STATE_OVERHEAD = 4096
+_NAME_SIZE = 64
+_WORLD_OBJECT_SIZE = 256
+
+
+def _estimate_size(state: tuple) -> int:
+    """
+    Approximates the memory held by a level state from its compressed tile layers and its world
+    object count, without walking the whole structure.
+    """
+    _, _, _, tile_layers, object_layers, _, _ = state
+    size = _STATE_OVERHEAD
+    for _, _, _, names, compressed_cells, locked_mask in tile_layers:
+        size += len(compressed_cells) + len(locked_mask) + _NAME_SIZE * len(names)
+    for _, _, world_objects in object_layers:
+        size += _WORLD_OBJECT_SIZE * len(world_objects)
+    return size
@@ -1,34 +1,75 @@
 from ._level_factory import LevelFactory
 from ._level_factory import LevelFactory
+from ..compression import find_level_file, with_codec_suffix
+from ..background_io import run_in_load_worker
+from .level_cache import LevelCache
 from pathlib import Path
-from typing import cast, TYPE_CHECKING
+from typing import Callable, TYPE_CHECKING
 import logging
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from ..level import Level
+    from ..compression import Codec
 
 
 class LevelLoader:
 
-    def __init__(self):
+    def __init__(self, cache: LevelCache | None = None):
+        """
+        Loaded levels are cached in `cache` if one is given; loaders sharing a cache share its
+        entries. Without a cache, every load reads the file.
+        """
         self.factory = LevelFactory()
+        self.cache = cache
         self._create_new_level()
 
-    def load_level(self, dir_path: str | Path, file_name: str = "level.json"):
-        """Loads a level from a file. The path of the level directory must be provided (instead of the level file itself)."""
-        if type(dir_path) == str:
-            dir_path = Path(dir_path)
-        dir_path = cast(Path, dir_path)
-        file_path = dir_path / file_name
-
-        if file_path.is_file():
-            from ..level import Level
-
-            return Level.load(str(file_path))
+    def load_level(
+        self,
+        dir_path: str | Path,
+        file_name: str = "level.json",
+        codec: "Codec | None" = None,
+        use_cache: bool = True,
+    ):
+        """
+        Loads a level from a file. The path of the level directory must be provided (instead of the level file itself).
+        Compressed variants of the file (e.g. 'level.json.xz') are found automatically unless a codec is given.
+        If the loader has a cache and `use_cache` isn't disabled, unchanged files are served from it; each call still returns a new Level.
+        """
+        file_path = self._find_level_file(dir_path, file_name, codec)
+        if file_path is not None:
+            return self._load_file(file_path, codec, use_cache)
         else:
             logging.info("Creating new level")
             self._create_new_level()
 
+    def load_level_async(
+        self,
+        dir_path: str | Path,
+        file_name: str = "level.json",
+        codec: "Codec | None" = None,
+        callback: "Callable[[Future[Level | None]], None] | None" = None,
+        use_cache: bool = True,
+    ) -> "Future[Level | None]":
+        """
+        Reads and builds the level on a background thread and returns a future resolving to it,
+        or to None if there's no level file. Unlike `load_level`, it never touches the loader's
+        own level, so creating a new level stays on the calling thread. The load can be cancelled
+        through the future until the worker starts it. The callback runs on the worker thread;
+        use `asyncio.wrap_future` to await the future from an event loop.
+        """
+
+        def _load():
+            file_path = self._find_level_file(dir_path, file_name, codec)
+            if file_path is None:
+                return None
+            return self._load_file(file_path, codec, use_cache)
+
+        future = run_in_load_worker(_load)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
     @property
     def level(self):
         if self._level is None:
@@ -40,5 +81,21 @@ class LevelLoader:
         """Sets the level to the given level."""
         self._level = value
 
+    @staticmethod
+    def _find_level_file(
+        dir_path: str | Path, file_name: str, codec: "Codec | None"
+    ) -> Path | None:
+        if codec is not None:
+            file_path = with_codec_suffix(Path(dir_path) / file_name, codec)
+            return file_path if file_path.is_file() else None
+        return find_level_file(dir_path, file_name)
+
+    def _load_file(self, file_path: Path, codec: "Codec | None", use_cache: bool):
+        from ..level import Level
+
+        if use_cache and self.cache is not None:
+            return self.cache.get(file_path, codec)
+        return Level.load(file_path, codec)
+
     def _create_new_level(self):
         self._level: "Level" = self.factory.create_level()
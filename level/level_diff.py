@@ -0,0 +1,288 @@
+from typing import TYPE_CHECKING
+from .grid_map.packed_grid import PackedGrid
+
+if TYPE_CHECKING:
+    from .grid_map.world_objects_map.world_object import WorldObjectRow
+    from .level import Level
+
+Position = tuple[int, int]
+
+
+class LevelDiff:
+    """
+    Structural differences between two levels. `offset` is how far the content of the first level
+    moved in the second one (e.g. (2, 0) after expanding it by two tiles to the left). Removed
+    tiles and objects use the coordinates of the first level; added ones use those of the second.
+    """
+
+    def __init__(self, size_before: Position, size_after: Position, offset: Position):
+        self.size_before = size_before
+        self.size_after = size_after
+        self.offset = offset
+        self.tiles_added: dict[str, list[Position]] = {}
+        self.tiles_removed: dict[str, list[Position]] = {}
+        self.objects_added: "list[WorldObjectRow]" = []
+        self.objects_removed: "list[WorldObjectRow]" = []
+        self.objects_moved: "list[tuple[WorldObjectRow, WorldObjectRow]]" = []
+        self.tag_changes: "list[tuple[WorldObjectRow, WorldObjectRow]]" = []
+
+    @property
+    def resized(self):
+        return self.size_before != self.size_after or self.offset != (0, 0)
+
+    @property
+    def is_empty(self):
+        return not (
+            self.resized
+            or any(self.tiles_added.values())
+            or any(self.tiles_removed.values())
+            or self.objects_added
+            or self.objects_removed
+            or self.objects_moved
+            or self.tag_changes
+        )
+
+    def __repr__(self):
+        return (
+            f"LevelDiff(size {self.size_before} -> {self.size_after}, offset={self.offset}, "
+            f"tiles +{sum(map(len, self.tiles_added.values()))}"
+            f"/-{sum(map(len, self.tiles_removed.values()))}, "
+            f"objects +{len(self.objects_added)}/-{len(self.objects_removed)}"
+            f"/~{len(self.objects_moved)}, tag changes {len(self.tag_changes)})"
+        )
+
+
+def diff_levels(before: "Level", after: "Level"):
+    """
+    Compares two levels layer by layer. Tile layers are compared as packed byte grids, row slices
+    at a time, after aligning them by the most likely resize offset; world objects are matched by
+    name and position, then by name to find moves.
+    """
+    tile_layer_names = [
+        layer.name
+        for layer in before.map.layers
+        if before.map.tilemap.has_layer(layer.name)
+        and after.map.tilemap.has_layer(layer.name)
+    ]
+    object_layer_names = [
+        layer.name
+        for layer in before.map.layers
+        if before.map.world_objects_map.has_layer(layer.name)
+        and after.map.world_objects_map.has_layer(layer.name)
+    ]
+
+    grids_before = {name: before.map.pack_layer(name) for name in tile_layer_names}
+    grids_after = {
+        name: _align_names(grids_before[name], after.map.pack_layer(name))
+        for name in tile_layer_names
+    }
+    objects_before = {
+        name: list(before.map.world_objects_map.layer_arrays(name))
+        for name in object_layer_names
+    }
+    objects_after = {
+        name: list(after.map.world_objects_map.layer_arrays(name))
+        for name in object_layer_names
+    }
+
+    offset = _estimate_offset(
+        before.map.grid_size,
+        after.map.grid_size,
+        list(zip(grids_before.values(), grids_after.values())),
+        [
+            (row_before, row_after)
+            for name in object_layer_names
+            for row_before in objects_before[name]
+            for row_after in objects_after[name]
+            if row_before.unique
+            and row_after.unique
+            and row_before.name == row_after.name
+        ],
+    )
+
+    diff = LevelDiff(before.map.grid_size, after.map.grid_size, offset)
+    for name in tile_layer_names:
+        added, removed = _diff_grids(grids_before[name], grids_after[name], offset)
+        diff.tiles_added[name] = added
+        diff.tiles_removed[name] = removed
+    for name in object_layer_names:
+        _diff_objects(diff, objects_before[name], objects_after[name], offset)
+
+    return diff
+
+
+def _align_names(reference: PackedGrid, grid: PackedGrid):
+    """
+    Re-encodes a grid so that names it shares with the reference grid use the same codes, which
+    lets both grids be compared byte by byte.
+    """
+    names = list(reference.names)
+    table = bytearray(range(256))
+    for code, name in enumerate(grid.names, start=1):
+        if name not in names:
+            names.append(name)
+        table[code] = names.index(name) + 1
+
+    return PackedGrid(grid.width, grid.height, grid.cells.translate(table), names)
+
+
+def _estimate_offset(
+    size_before: Position,
+    size_after: Position,
+    grid_pairs: "list[tuple[PackedGrid, PackedGrid]]",
+    unique_object_pairs: "list[tuple[WorldObjectRow, WorldObjectRow]]",
+) -> Position:
+    """
+    Picks, among the offsets a resize could have produced (no shift, the size difference on
+    either axis, and the displacement of each unique object), the one leaving fewest tile changes.
+    """
+    width_change = size_after[0] - size_before[0]
+    height_change = size_after[1] - size_before[1]
+    candidates: dict[Position, None] = {
+        (0, 0): None,
+        (width_change, 0): None,
+        (0, height_change): None,
+        (width_change, height_change): None,
+    }
+    for row_before, row_after in unique_object_pairs:
+        candidates[
+            (
+                row_after.position[0] - row_before.position[0],
+                row_after.position[1] - row_before.position[1],
+            )
+        ] = None
+
+    if not grid_pairs:
+        return (0, 0)
+
+    best_offset, best_score = (0, 0), None
+    for offset in candidates:
+        score = sum(
+            _count_changes(before, after, offset) for before, after in grid_pairs
+        )
+        if best_score is None or score < best_score:
+            best_offset, best_score = offset, score
+    return best_offset
+
+
+def _overlap(before: PackedGrid, after: PackedGrid, offset: Position):
+    """Returns the x and y ranges, in the coordinates of `before`, present in both grids."""
+    dx, dy = offset
+    xs = range(max(0, -dx), min(before.width, after.width - dx))
+    ys = range(max(0, -dy), min(before.height, after.height - dy))
+    return xs, ys
+
+
+def _count_changes(before: PackedGrid, after: PackedGrid, offset: Position):
+    dx, dy = offset
+    xs, ys = _overlap(before, after, offset)
+    if not xs or not ys:
+        return before.occupied_count() + after.occupied_count()
+
+    changes = 0
+    overlap_before = 0
+    overlap_after = 0
+    for y in ys:
+        row_before = before.row(y)[xs.start : xs.stop]
+        row_after = after.row(y + dy)[xs.start + dx : xs.stop + dx]
+        overlap_before += len(row_before) - row_before.tobytes().count(0)
+        overlap_after += len(row_after) - row_after.tobytes().count(0)
+        if row_before == row_after:
+            continue
+        changes += sum(1 for a, b in zip(row_before, row_after) if a != b)
+
+    # Occupied cells outside the overlap were added or removed by the resize.
+    changes += before.occupied_count() - overlap_before
+    changes += after.occupied_count() - overlap_after
+    return changes
+
+
+def _diff_grids(before: PackedGrid, after: PackedGrid, offset: Position):
+    dx, dy = offset
+    xs, ys = _overlap(before, after, offset)
+    added: list[Position] = []
+    removed: list[Position] = []
+
+    for y in range(before.height):
+        row_before = before.row(y)
+        in_overlap_row = y in ys
+        if in_overlap_row:
+            row_after = after.row(y + dy)
+            if (
+                row_before[xs.start : xs.stop]
+                == row_after[xs.start + dx : xs.stop + dx]
+            ):
+                # Only the cells outside the overlap can differ on this row.
+                columns = [x for x in range(before.width) if x not in xs]
+            else:
+                columns = range(before.width)
+        else:
+            columns = range(before.width)
+
+        for x in columns:
+            code_before = row_before[x]
+            if in_overlap_row and x in xs:
+                code_after = row_after[x + dx]
+                if code_before == code_after:
+                    continue
+                if code_after:
+                    added.append((x + dx, y + dy))
+            if code_before:
+                removed.append((x, y))
+
+    # Cells of `after` that don't exist in `before` are all new.
+    for y in range(after.height):
+        for x in range(after.width):
+            if (x - dx) in xs and (y - dy) in ys:
+                continue
+            if after.cells[y * after.width + x]:
+                added.append((x, y))
+
+    return added, removed
+
+
+def _diff_objects(
+    diff: LevelDiff,
+    objects_before: "list[WorldObjectRow]",
+    objects_after: "list[WorldObjectRow]",
+    offset: Position,
+):
+    dx, dy = offset
+    remaining_after: "dict[tuple[str, Position], list[WorldObjectRow]]" = {}
+    for row in objects_after:
+        remaining_after.setdefault((row.name, row.position), []).append(row)
+
+    # Objects still in place (once the resize offset is applied).
+    unmatched_before: "list[WorldObjectRow]" = []
+    for row in objects_before:
+        key = (row.name, (row.position[0] + dx, row.position[1] + dy))
+        candidates = remaining_after.get(key)
+        if not candidates:
+            unmatched_before.append(row)
+            continue
+        row_after = candidates.pop()
+        if set(row.tags) != set(row_after.tags):
+            diff.tag_changes.append((row, row_after))
+
+    unmatched_after = [row for rows in remaining_after.values() for row in rows]
+
+    # Objects with the same name on both sides are paired, nearest first, as moves.
+    for row in unmatched_before:
+        same_name = [
+            row_after for row_after in unmatched_after if row_after.name == row.name
+        ]
+        if not same_name:
+            diff.objects_removed.append(row)
+            continue
+        target = (row.position[0] + dx, row.position[1] + dy)
+        row_after = min(
+            same_name,
+            key=lambda other: abs(other.position[0] - target[0])
+            + abs(other.position[1] - target[1]),
+        )
+        unmatched_after.remove(row_after)
+        diff.objects_moved.append((row, row_after))
+        if set(row.tags) != set(row_after.tags):
+            diff.tag_changes.append((row, row_after))
+
+    diff.objects_added.extend(unmatched_after)
@@ -0,0 +1,178 @@
+import zlib
+from pytiling import Tileset
+from .grid_map import MixedMap
+from .grid_map.editor_tilemap.editor_tilemap_layer import EditorTilemapLayer
+from .grid_map.world_objects_map import WorldObjectsLayer
+from .grid_map.world_objects_map.world_object import WorldObjectRepresentation
+from .level import Level
+from .utils import from_asset_relative_path, to_asset_relative_path
+
+STATE_VERSION = 2
+
+# Tilesets are immutable assets, so every level restored in a process shares them.
+_tilesets: dict[str, Tileset] = {}
+
+
+def level_state(level: Level):
+    """
+    Returns a compact, picklable state of the level: tilesets and icons are referenced by asset
+    path, tile layers are stored as zlib-compressed packed grids (with a bitmask of their locked
+    tiles) and world objects as plain tuples.
+    UI state (the toggler's Tk variables), event connections and back-references are left out.
+    """
+    mixed_map = level.map
+    tile_layers = []
+    object_layers = []
+
+    for layer in mixed_map.layers:
+        if mixed_map.tilemap.has_layer(layer.name):
+            tile_layer = mixed_map.get_tilemap_layer(layer.name)
+            grid = mixed_map.pack_layer(layer.name)
+            tile_layers.append(
+                (
+                    layer.name,
+                    to_asset_relative_path(tile_layer.tileset.tileset_path),
+                    to_asset_relative_path(tile_layer.icon_path),
+                    grid.names,
+                    zlib.compress(bytes(grid.cells)),
+                    _locked_mask(mixed_map, tile_layer),
+                )
+            )
+        else:
+            object_layer = mixed_map.get_world_objects_layer(layer.name)
+            object_layers.append(
+                (
+                    layer.name,
+                    to_asset_relative_path(object_layer.icon_path),
+                    [
+                        (row.position, row.name, row.tags, row.locked, row.unique)
+                        for row in mixed_map.world_objects_map.layer_arrays(layer.name)
+                    ],
+                )
+            )
+
+    return (
+        STATE_VERSION,
+        level.name,
+        (
+            mixed_map.tile_size,
+            mixed_map.grid_size,
+            mixed_map.min_grid_size,
+            mixed_map.max_grid_size,
+        ),
+        tile_layers,
+        object_layers,
+        mixed_map.layer_concurrences,
+        sorted(mixed_map.tilemap.locked_edges),
+    )
+
+
+def restore_level(state) -> Level:
+    """Rebuilds a level from the state returned by `level_state`."""
+    (
+        version,
+        name,
+        sizes,
+        tile_layers,
+        object_layers,
+        layer_concurrences,
+        locked_edges,
+    ) = state
+    if version != STATE_VERSION:
+        raise ValueError(f"Unsupported pickled level state version: {version}.")
+
+    mixed_map = MixedMap(*sizes)
+    for layer_name, tileset_path, icon_path, _, _, _ in tile_layers:
+        mixed_map.tilemap.add_layer(
+            EditorTilemapLayer(
+                layer_name,
+                _get_tileset(tileset_path),
+                str(from_asset_relative_path(icon_path)),
+            )
+        )
+    for layer_name, icon_path, _ in object_layers:
+        mixed_map.world_objects_map.add_layer(
+            WorldObjectsLayer(layer_name, str(from_asset_relative_path(icon_path)))
+        )
+    mixed_map.populate_layers()
+    for layer_names in layer_concurrences:
+        mixed_map.add_layer_concurrence(*layer_names)
+
+    level = Level(mixed_map)
+    level.name = name
+
+    with mixed_map.batch():
+        _restore_tiles(mixed_map, tile_layers)
+        # The locked tiles are restored from their flags, since levels built from a file don't
+        # record which edges were locked.
+        mixed_map.tilemap.locked_edges = set(locked_edges)
+
+        for layer_name, _, world_objects in object_layers:
+            layer = mixed_map.get_world_objects_layer(layer_name)
+            for position, object_name, tags, locked, unique in world_objects:
+                world_object = WorldObjectRepresentation(position, object_name, tags)
+                world_object.locked = locked
+                world_object.unique = unique
+                layer.add_element(world_object)
+
+    return level
+
+
+def _restore_tiles(mixed_map: MixedMap, tile_layers):
+    width = mixed_map.grid_size[0]
+    tilemap = mixed_map.tilemap
+
+    for layer_name, _, _, names, compressed_cells, locked_mask in tile_layers:
+        layer = mixed_map.get_tilemap_layer(layer_name)
+        cells = zlib.decompress(compressed_cells)
+        # Tiles other than platforms are reported to the MixedMap once per layer.
+        added = []
+        for index, code in enumerate(cells):
+            if not code:
+                continue
+            position = (index % width, index // width)
+            tile_name = names[code - 1]
+            if layer_name == "platforms" and tile_name == "platform":
+                tilemap.create_basic_platform_at(position, apply_formatting=False)
+            else:
+                with layer.unreported():
+                    layer.create_autotile_tile_at(
+                        position, tile_name, apply_formatting=False
+                    )
+                if layer.get_tile_at(position) is not None:
+                    added.append(position)
+        if added:
+            mixed_map.notify_elements_changed(layer_name, added=added)
+
+        for byte_index, byte in enumerate(zlib.decompress(locked_mask)):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    index = byte_index * 8 + bit
+                    tile = layer.get_tile_at((index % width, index // width))
+                    if tile is not None:
+                        tile.locked = True
+
+    tilemap.format_all_tiles()
+
+
+def _locked_mask(mixed_map: MixedMap, layer):
+    """Returns the zlib-compressed bitmask, one bit per cell in row-major order, of locked tiles."""
+    width, height = mixed_map.grid_size
+    mask = bytearray((width * height + 7) // 8)
+    for element in mixed_map.tilemap.all_elements:
+        if element.layer is layer and element.locked:
+            x, y = element.position
+            index = y * width + x
+            mask[index >> 3] |= 1 << (index & 7)
+    return zlib.compress(bytes(mask))
+
+
+def _get_tileset(relative_path: str):
+    tileset = _tilesets.get(relative_path)
+    if tileset is None:
+        tileset = _tilesets[relative_path] = Tileset(
+            str(from_asset_relative_path(relative_path))
+        )
+    return tileset
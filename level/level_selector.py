@@ -1,20 +1,25 @@
 from typing import Callable, Any
+from .event_bus import EventBus, Schedule
 
 
 class LevelSelector:
-    def __init__(self):
+    def __init__(self, schedule: Schedule | None = None):
+        """
+        Select callbacks are delivered synchronously unless a `schedule` function is given (e.g. the
+        root window's `after_idle`), in which case bursts of selections are coalesced per frame.
+        """
         self._selections: dict[str, Any] = {}
-        self._selection_callbacks: dict[str, Callable[[str], None]] = {}
+        self.events = EventBus(schedule)
 
     def set_selection(self, selection_name: str, selection_value: Any):
         self._selections[selection_name] = selection_value
-
-        callback = self._selection_callbacks.get(selection_name)
-        if callback is not None:
-            callback(selection_value)
+        self.events.publish(selection_name, selection_value)
 
     def get_selection(self, selection_name: str) -> Any:
         return self._selections[selection_name]
 
-    def set_select_callback(self, selection_name: str, callback: Callable[[str], None]):
-        self._selection_callbacks[selection_name] = callback
+    def set_select_callback(
+        self, selection_name: str, callback: Callable[[Any], None], weak: bool = False
+    ):
+        """Subscribes a callback to a selection. Returns the subscription, used to unsubscribe it."""
+        return self.events.subscribe(selection_name, callback, weak)
@@ -0,0 +1,69 @@
+from typing import TYPE_CHECKING, NamedTuple, Sequence
+from .grid_map.packed_grid import PackedGrid
+from .grid_map.windowing import extract_windows
+from .grid_map.world_objects_map.world_object import WorldObjectRow
+
+if TYPE_CHECKING:
+    from .level import Level
+
+
+class LevelSnapshot(NamedTuple):
+    """
+    Immutable copy of a level at a given map version: every layer as the bytes of its packed grid
+    and every world object as a row. It can be read from any thread without locking.
+    """
+
+    version: int
+    name: str
+    grid_size: tuple[int, int]
+    layer_names: tuple[str, ...]
+    layer_cells: tuple[bytes, ...]
+    layer_element_names: tuple[tuple[str, ...], ...]
+    world_objects: tuple[WorldObjectRow, ...]
+
+    @classmethod
+    def from_level(cls, level: "Level"):
+        """Builds the snapshot. The caller must hold the map's read lock."""
+        mixed_map = level.map
+        grids = [mixed_map.pack_layer(layer.name) for layer in mixed_map.layers]
+        return cls(
+            mixed_map.version,
+            level.name,
+            mixed_map.grid_size,
+            tuple(layer.name for layer in mixed_map.layers),
+            tuple(bytes(grid.cells) for grid in grids),
+            tuple(tuple(grid.names) for grid in grids),
+            tuple(
+                row
+                for layer in mixed_map.world_objects_map.layers
+                for row in mixed_map.world_objects_map.layer_arrays(layer.name)
+            ),
+        )
+
+    def cells(self, layer_name: str):
+        return self.layer_cells[self.layer_names.index(layer_name)]
+
+    def packed_grid(self, layer_name: str):
+        """Returns a private PackedGrid copy of a layer."""
+        index = self.layer_names.index(layer_name)
+        return PackedGrid(
+            self.grid_size[0],
+            self.grid_size[1],
+            bytearray(self.layer_cells[index]),
+            list(self.layer_element_names[index]),
+        )
+
+    def positions_of(self, name: str):
+        return [row.position for row in self.world_objects if row.name == name]
+
+    def extract_windows(
+        self,
+        positions: Sequence[tuple[int, int]],
+        size: int,
+        out=None,
+        pad: int = 0,
+        layer_names: Sequence[str] | None = None,
+    ):
+        """Returns padded windows around the positions, see `grid_map.windowing.extract_windows`."""
+        layers = [self.cells(name) for name in (layer_names or self.layer_names)]
+        return extract_windows(layers, self.grid_size, positions, size, out, pad)
@@ -1,14 +1,31 @@
-from typing import Callable
-from customtkinter import BooleanVar
+from typing import TYPE_CHECKING, Callable
+from .event_bus import EventBus, Schedule
+
+if TYPE_CHECKING:
+    from customtkinter import BooleanVar
 
 
 class LevelToggler:
-    def __init__(self):
-        self.vars: dict[str, BooleanVar] = {}
+    def __init__(self, schedule: Schedule | None = None):
+        """
+        Toggle callbacks are delivered synchronously unless a `schedule` function is given (e.g. the
+        root window's `after_idle`), in which case bursts of toggles are coalesced per frame.
+        """
+        self.vars: dict[str, "BooleanVar"] = {}
+        self.events = EventBus(schedule)
 
     def _add_var(self, var_name: str, value: bool = False):
+        # Imported here so levels can be loaded headless, without Tk.
+        from customtkinter import BooleanVar
+
         var = BooleanVar(value=value)
         self.vars[var_name] = var
+
+        # A single trace per variable forwards its writes to the event bus subscribers.
+        def _publish(*args):
+            self.events.publish(var_name, var.get())
+
+        var.trace_add("write", _publish)
         return var
 
     def get_var(self, var_name: str):
@@ -17,14 +34,11 @@ class LevelToggler:
 
         return self.vars[var_name]
 
-    def set_toggle_callback(self, var_name: str, callback: Callable[[bool], None]):
+    def set_toggle_callback(
+        self, var_name: str, callback: Callable[[bool], None], weak: bool = False
+    ):
+        """Subscribes a callback to a toggle. Returns the subscription, used to unsubscribe it."""
         if var_name not in self.vars:
             self._add_var(var_name)
 
-        def formatted_callback(*args):
-            callback(self.vars[var_name].get())
-
-        self.vars[var_name].trace_add("write", formatted_callback)
-
-
-# self.var.trace_add("write", self.on_toggle)
+        return self.events.subscribe(var_name, callback, weak)
@@ -0,0 +1,202 @@
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, ParamSpec, TypeVar
+
+ENV_VAR = "LEVEL_PROFILE"
+# Bounds on what a long profiled session keeps in memory.
+LATENCY_SAMPLE_SIZE = 2048
+MAX_TRACE_EVENTS = 100_000
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class OperationStats:
+    """
+    Aggregated measurements of a single instrumented operation. Counts, totals and the maximum
+    are exact; percentiles come from a uniform reservoir sample of the call latencies, so memory
+    stays bounded however many calls are recorded.
+    """
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.tiles_formatted = 0
+        self.sample_size = sample_size
+        self.durations_ns: list[int] = []
+        self._random = random.Random(0)
+
+    def add(self, duration_ns: int, tiles_formatted: int):
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.tiles_formatted += tiles_formatted
+        if len(self.durations_ns) < self.sample_size:
+            self.durations_ns.append(duration_ns)
+        else:
+            index = self._random.randrange(self.count)
+            if index < self.sample_size:
+                self.durations_ns[index] = duration_ns
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Nearest-rank percentile of the sampled call latencies, in milliseconds."""
+        if not self.durations_ns:
+            return 0.0
+        ordered = sorted(self.durations_ns)
+        rank = max(0, min(len(ordered) - 1, round(percentile / 100 * len(ordered)) - 1))
+        return ordered[rank] / 1e6
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile_ms(50),
+            "p90_ms": self.percentile_ms(90),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": self.max_ns / 1e6,
+            "tiles_formatted": self.tiles_formatted,
+            "tiles_formatted_per_call": (
+                self.tiles_formatted / self.count if self.count else 0.0
+            ),
+        }
+
+
+class Profiler:
+    """
+    Collects per-operation statistics and trace events for instrumented calls. Only the latest
+    `max_events` trace events are kept.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = MAX_TRACE_EVENTS):
+        self.enabled = enabled
+        self.stats: dict[str, OperationStats] = {}
+        self._events: deque[dict] = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str):
+        """Measures the enclosed block as one call of the named operation."""
+        stack: list[list[int]] = self._span_stack()
+        frame = [0]
+        stack.append(frame)
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_ns = time.perf_counter_ns()
+            stack.pop()
+            # Tile counts are inclusive: an operation also counts the tiles formatted by the
+            # instrumented operations it calls.
+            if stack:
+                stack[-1][0] += frame[0]
+            self._record(name, start_ns, end_ns, frame[0])
+
+    def count_formatted_tiles(self, count: int):
+        """Attributes formatted tiles to the innermost running operation."""
+        stack = self._span_stack()
+        if stack:
+            stack[-1][0] += count
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+            self._events.clear()
+            self._origin_ns = time.perf_counter_ns()
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def export_json(self, path: str | Path):
+        """Writes the per-operation summary to a JSON file."""
+        Path(path).write_text(self.to_json())
+
+    def export_chrome_trace(self, path: str | Path):
+        """Writes the retained calls as a Chrome trace file (chrome://tracing, Perfetto)."""
+        with self._lock:
+            trace = {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+        Path(path).write_text(json.dumps(trace))
+
+    def _span_stack(self) -> list[list[int]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name: str, start_ns: int, end_ns: int, tiles_formatted: int):
+        duration_ns = end_ns - start_ns
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = OperationStats()
+            stats.add(duration_ns, tiles_formatted)
+            self._events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start_ns - self._origin_ns) / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"tiles_formatted": tiles_formatted},
+                }
+            )
+
+
+_profiler = Profiler(enabled=os.environ.get(ENV_VAR, "") not in ("", "0"))
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+@contextmanager
+def profiling(reset: bool = True):
+    """
+    Enables profiling inside the block and yields the profiler holding the results. Profiling can
+    also be enabled for the whole process with the LEVEL_PROFILE=1 environment variable.
+    """
+    previously_enabled = _profiler.enabled
+    if reset:
+        _profiler.reset()
+    _profiler.enabled = True
+    try:
+        yield _profiler
+    finally:
+        _profiler.enabled = previously_enabled
+
+
+def profiled(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator that records every call of the function under the given operation name."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _profiler.enabled:
+                return func(*args, **kwargs)
+            with _profiler.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count_formatted_tiles(count: int):
+    """Reports formatted tiles to the running operation. Does nothing while profiling is disabled."""
+    if _profiler.enabled:
+        _profiler.count_formatted_tiles(count)
@@ -0,0 +1,89 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Lets any number of threads read at once while writes are exclusive. Waiting writers are served
+    before new readers, so a stream of background reads can't starve the editor. Both sides are
+    reentrant, and the writing thread may also read; a reading thread can't upgrade to writing.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: dict[int, int] = {}
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        thread = threading.get_ident()
+        with self._condition:
+            if self._writer == thread or thread in self._readers:
+                self._readers[thread] = self._readers.get(thread, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers[thread] = 1
+
+    def release_read(self):
+        thread = threading.get_ident()
+        with self._condition:
+            depth = self._readers.get(thread)
+            if depth is None:
+                raise RuntimeError("Releasing a read lock that isn't held.")
+            if depth > 1:
+                self._readers[thread] = depth - 1
+                return
+            del self._readers[thread]
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        thread = threading.get_ident()
+        with self._condition:
+            if self._writer == thread:
+                self._writer_depth += 1
+                return
+            if thread in self._readers:
+                raise RuntimeError("A read lock can't be upgraded to a write lock.")
+
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = thread
+            self._writer_depth = 1
+
+    def release_write(self):
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Releasing a write lock that isn't held.")
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+    def holds_read_only(self):
+        """Whether the calling thread holds the read lock without the write lock."""
+        thread = threading.get_ident()
+        with self._condition:
+            return thread in self._readers and self._writer != thread
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -6,9 +6,15 @@ from pytiling.serialization import (
 from pytiling.tileset import Tileset
 from level.utils import from_asset_relative_path
 
+_initialized = False
+
 
 def initialize_level_deserializers():
-    """Registers the deserializers for the level-specific classes."""
+    """Registers the deserializers for the level-specific classes. Later calls do nothing."""
+    global _initialized
+    if _initialized:
+        return
+    _initialized = True
 
     def _deserialize_world_object_representation(data):
         from .grid_map.world_objects_map.world_object import (
@@ -0,0 +1,298 @@
+import json
+import secrets
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Mapping, Sequence
+from .grid_map.packed_grid import PackedGrid
+from .grid_map.windowing import extract_windows
+from .grid_map.world_objects_map.world_object import WorldObjectRow
+
+if TYPE_CHECKING:
+    from .level import Level
+
+_MAGIC = b"LVLP"
+_FORMAT_VERSION = 1
+# Data segment header: magic, format version, generation, metadata length.
+_HEADER = struct.Struct("<4sIQI")
+# Control segment: a sequence counter, the generation, then the length and name of the current
+# data segment. The sequence is odd while the publisher rewrites the segment (a seqlock).
+_CONTROL = struct.Struct("<QQI")
+_SEQUENCE = struct.Struct("<Q")
+_MAX_SEGMENT_NAME = 64
+
+
+class SharedLevelView:
+    """
+    Read-only view of a level published in a SharedLevelPool. The cells of each layer are a
+    memoryview over the shared segment laid out like a PackedGrid, so nothing is copied.
+    """
+
+    def __init__(self, level_id, metadata: dict, data: memoryview):
+        self.level_id = level_id
+        self.name: str = metadata["name"]
+        self.grid_size: tuple[int, int] = tuple(metadata["grid_size"])
+        self.world_objects = [
+            WorldObjectRow((x, y), name, tuple(tags), locked, unique)
+            for x, y, name, tags, locked, unique in metadata["world_objects"]
+        ]
+        self._names: dict[str, list[str]] = {}
+        self._cells: dict[str, memoryview] = {}
+        size = self.grid_size[0] * self.grid_size[1]
+        for layer_name, offset, names in metadata["layers"]:
+            self._names[layer_name] = names
+            self._cells[layer_name] = data[offset : offset + size]
+
+    @property
+    def layer_names(self):
+        return list(self._cells)
+
+    def cells(self, layer_name: str):
+        return self._cells[layer_name]
+
+    def names(self, layer_name: str):
+        return self._names[layer_name]
+
+    def packed_grid(self, layer_name: str):
+        """Returns a private PackedGrid copy of a layer."""
+        width, height = self.grid_size
+        return PackedGrid(
+            width,
+            height,
+            bytearray(self._cells[layer_name]),
+            list(self._names[layer_name]),
+        )
+
+    def positions_of(self, name: str):
+        return [row.position for row in self.world_objects if row.name == name]
+
+    def extract_windows(
+        self,
+        positions: Sequence[tuple[int, int]],
+        size: int,
+        out=None,
+        pad: int = 0,
+        layer_names: Sequence[str] | None = None,
+    ):
+        """
+        Returns the `size` x `size` windows centred on each position for the given layers (all by
+        default), laid out as [position][layer][row][column], straight from the shared memory.
+        Cells hold the layer's name codes (see `names`) and `pad` outside the map.
+        """
+        layers = [self._cells[name] for name in (layer_names or self._cells)]
+        return extract_windows(layers, self.grid_size, positions, size, out, pad)
+
+
+class SharedLevelPool:
+    """
+    Publishes a batch of levels to shared memory once, for any number of worker processes to read
+    through a SharedLevelPoolReader. The layers of every level are stored as packed grids and the
+    world objects as plain rows. Publishing a new batch creates a new data segment and bumps the
+    generation counter of the pool's small control segment; readers pick it up on `refresh`
+    without restarting.
+    """
+
+    def __init__(self, name: str | None = None):
+        self.name = name or f"level_pool_{secrets.token_hex(6)}"
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(
+            self.name, create=True, size=_CONTROL.size + _MAX_SEGMENT_NAME
+        )
+        self._sequence = 0
+        _CONTROL.pack_into(self._control.buf, 0, 0, 0, 0)
+        self._data: shared_memory.SharedMemory | None = None
+
+    def publish(self, levels: "Sequence[Level] | Mapping[str, Level]"):
+        """
+        Publishes the levels, identified by their index or, for a mapping, by their key.
+        Returns the new generation.
+        """
+        items = levels.items() if isinstance(levels, Mapping) else enumerate(levels)
+
+        entries = []
+        grids: list[bytes] = []
+        offset = 0
+        for level_id, level in items:
+            layers = []
+            for layer in level.map.layers:
+                grid = level.map.pack_layer(layer.name)
+                layers.append((layer.name, offset, grid.names))
+                grids.append(bytes(grid.cells))
+                offset += len(grid.cells)
+            world_objects = [
+                (*row.position, row.name, list(row.tags), row.locked, row.unique)
+                for layer in level.map.world_objects_map.layers
+                for row in level.map.world_objects_map.layer_arrays(layer.name)
+            ]
+            entries.append(
+                {
+                    "id": level_id,
+                    "name": level.name,
+                    "grid_size": level.map.grid_size,
+                    "layers": layers,
+                    "world_objects": world_objects,
+                }
+            )
+
+        generation = self.generation + 1
+        segment_name = f"{self.name}_{generation}"
+        encoded_name = segment_name.encode()
+        if len(encoded_name) > _MAX_SEGMENT_NAME:
+            raise ValueError(f"Shared level pool name too long: {self.name}")
+
+        metadata = json.dumps(entries, separators=(",", ":")).encode()
+        data_start = _HEADER.size + len(metadata)
+        data = shared_memory.SharedMemory(
+            segment_name, create=True, size=max(1, data_start + offset)
+        )
+        _HEADER.pack_into(
+            data.buf, 0, _MAGIC, _FORMAT_VERSION, generation, len(metadata)
+        )
+        data.buf[_HEADER.size : data_start] = metadata
+        data.buf[data_start : data_start + offset] = b"".join(grids)
+
+        # Readers retry while the sequence is odd or changed during their read, so they never
+        # see a generation paired with a partially written segment name.
+        control = self._control.buf
+        _SEQUENCE.pack_into(control, 0, self._sequence + 1)
+        control[_CONTROL.size : _CONTROL.size + len(encoded_name)] = encoded_name
+        _CONTROL.pack_into(
+            control, 0, self._sequence + 1, generation, len(encoded_name)
+        )
+        self._sequence += 2
+        _SEQUENCE.pack_into(control, 0, self._sequence)
+
+        # Readers attached to the previous segment keep their mapping until they refresh.
+        self._release_data()
+        self._data = data
+        self.generation = generation
+        return generation
+
+    def close(self):
+        """Unlinks the pool's segments. Readers must not refresh after this."""
+        self._release_data()
+        self._control.close()
+        self._control.unlink()
+
+    def _release_data(self):
+        if self._data is not None:
+            self._data.close()
+            self._data.unlink()
+            self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedLevelPoolReader:
+    """
+    Attaches to a SharedLevelPool from a worker process. Levels are read-only views over the
+    shared segment; call `refresh` to switch to the latest published generation.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.generation = 0
+        self._control = _attach(name)
+        self._data: shared_memory.SharedMemory | None = None
+        self._retired: list[shared_memory.SharedMemory] = []
+        self._levels: dict = {}
+        self.refresh()
+
+    def refresh(self):
+        """Attaches to the latest generation if it changed. Returns whether it did."""
+        while True:
+            generation, segment_name = self._read_control()
+            if generation == self.generation:
+                return False
+            try:
+                data = _attach(segment_name)
+                break
+            except FileNotFoundError:
+                # Unless the segment was replaced while being attached, the pool is gone.
+                if self._read_control()[0] == generation:
+                    raise
+
+        magic, version, data_generation, metadata_length = _HEADER.unpack_from(
+            data.buf, 0
+        )
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            data.close()
+            raise ValueError(f"Unsupported shared level pool segment: {segment_name}")
+
+        view = data.buf.toreadonly()
+        data_start = _HEADER.size + metadata_length
+        entries = json.loads(bytes(view[_HEADER.size : data_start]))
+        levels = {
+            entry["id"]: SharedLevelView(entry["id"], entry, view[data_start:])
+            for entry in entries
+        }
+
+        # The previous levels are dropped first so their views don't keep the old segment open.
+        self._levels = levels
+        self._retire_data()
+        self._data = data
+        self.generation = data_generation
+        return True
+
+    def get(self, level_id):
+        return self._levels[level_id]
+
+    @property
+    def ids(self):
+        return list(self._levels)
+
+    def __len__(self):
+        return len(self._levels)
+
+    def close(self):
+        """Detaches from the pool. Level views obtained from the reader must be released first."""
+        self._levels = {}
+        self._retire_data()
+        self._close_retired()
+        self._control.close()
+
+    def _read_control(self):
+        buf = self._control.buf
+        while True:
+            sequence, generation, name_length = _CONTROL.unpack_from(buf, 0)
+            if sequence % 2:
+                continue
+            segment_name = bytes(buf[_CONTROL.size : _CONTROL.size + name_length])
+            if _SEQUENCE.unpack_from(buf, 0)[0] == sequence:
+                return generation, segment_name.decode()
+
+    def _retire_data(self):
+        if self._data is not None:
+            self._retired.append(self._data)
+            self._data = None
+        self._close_retired()
+
+    def _close_retired(self):
+        # A segment can only be closed once no view of it is alive, e.g. in a previous level.
+        still_open = []
+        for segment in self._retired:
+            try:
+                segment.close()
+            except BufferError:
+                still_open.append(segment)
+        self._retired = still_open
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach(name: str):
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13, attaching registers the segment with the resource tracker, which
+        # would unlink it when the worker exits. The publisher owns it.
+        segment = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
@@ -0,0 +1,194 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from .compression import find_level_file, read_level_data
+
+if TYPE_CHECKING:
+    from .level import Level
+
+THUMBNAIL_FILE_NAME = "thumbnail.png"
+
+EMPTY_COLOR = (28, 24, 36)
+PLATFORM_COLOR = (150, 140, 160)
+WORLD_OBJECT_COLORS = {
+    "delver": (70, 160, 255),
+    "goal": (255, 200, 60),
+}
+DEFAULT_WORLD_OBJECT_COLOR = (230, 80, 80)
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_HASH_KEY = "level-hash"
+_SOURCE_KEY = "level-source"
+_SCALE_KEY = "level-scale"
+
+
+def render_thumbnail(
+    level: "Level", scale: int = 2, level_hash: str | None = None
+) -> bytes:
+    """
+    Renders a minimap of the level as PNG bytes, straight from the packed platforms grid and the
+    world object positions, with `scale` pixels per tile. The level hash recorded in the image is
+    computed unless it is given.
+    """
+    width, height = level.map.grid_size
+    colors = [
+        PLATFORM_COLOR if code else EMPTY_COLOR
+        for code in level.map.pack_layer("platforms").cells
+    ]
+    for layer in level.map.world_objects_map.layers:
+        for world_object in level.map.world_objects_map.layer_arrays(layer.name):
+            x, y = world_object.position
+            colors[y * width + x] = WORLD_OBJECT_COLORS.get(
+                world_object.name, DEFAULT_WORLD_OBJECT_COLOR
+            )
+
+    rows = []
+    for y in range(height):
+        row = bytearray()
+        for color in colors[y * width : (y + 1) * width]:
+            row += bytes(color) * scale
+        rows.extend([bytes(row)] * scale)
+
+    text = {_HASH_KEY: level_hash or level.to_hash(), _SCALE_KEY: str(scale)}
+    return _encode_png(width * scale, height * scale, rows, text)
+
+
+def ensure_thumbnail(
+    dir_path: str | Path, file_name: str = "level.json", scale: int = 2
+) -> Path | None:
+    """
+    Makes sure the level directory holds an up to date thumbnail and returns its path, or None if
+    there's no level file. The thumbnail records the level hash, its scale and the size and
+    modification time of the level file: if the file is untouched the level isn't even read, and
+    if it changed without changing the level hash only the recorded metadata is refreshed, from
+    the hash of the file's data. The level is only built when the image has to be redrawn.
+    """
+    from .level import Level, hash_level_data
+
+    level_path = find_level_file(dir_path, file_name)
+    if level_path is None:
+        return None
+
+    thumbnail_path = level_path.parent / THUMBNAIL_FILE_NAME
+    source = _source_stamp(level_path, scale)
+    chunks = _read_png_chunks(thumbnail_path)
+    text = _text_from_chunks(chunks)
+    if text.get(_SOURCE_KEY) == source:
+        return thumbnail_path
+
+    data = read_level_data(level_path)
+    level_hash = hash_level_data(data)
+    if (
+        chunks
+        and text.get(_HASH_KEY) == level_hash
+        and text.get(_SCALE_KEY) == str(scale)
+    ):
+        _write_chunks(thumbnail_path, _with_text(chunks, {_SOURCE_KEY: source}))
+        return thumbnail_path
+
+    png = render_thumbnail(Level.from_dict(data), scale, level_hash)
+    _write_chunks(thumbnail_path, _with_text(_split_chunks(png), {_SOURCE_KEY: source}))
+    return thumbnail_path
+
+
+def render_folder(
+    folder: str | Path,
+    file_name: str = "level.json",
+    scale: int = 2,
+    workers: int | None = None,
+) -> list[Path]:
+    """
+    Brings the thumbnails of every level directory inside a save folder up to date, using a pool
+    of worker processes. Returns the paths of the thumbnails.
+    """
+    level_dirs = sorted(path for path in Path(folder).iterdir() if path.is_dir())
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            ensure_thumbnail,
+            level_dirs,
+            [file_name] * len(level_dirs),
+            [scale] * len(level_dirs),
+            chunksize=max(1, len(level_dirs) // (workers * 4)),
+        )
+        return [path for path in results if path is not None]
+
+
+def _source_stamp(path: Path, scale: int):
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}:{scale}"
+
+
+def _encode_png(width: int, height: int, rows: list[bytes], text: dict[str, str]):
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    # Every row starts with filter type 0 (none).
+    image_data = zlib.compress(b"".join(b"\x00" + row for row in rows), 9)
+    chunks = [(b"IHDR", header)]
+    chunks += [
+        (b"tEXt", f"{key}\x00{value}".encode("latin-1")) for key, value in text.items()
+    ]
+    chunks += [(b"IDAT", image_data), (b"IEND", b"")]
+    return _join_chunks(chunks)
+
+
+def _join_chunks(chunks: list[tuple[bytes, bytes]]):
+    output = bytearray(_PNG_SIGNATURE)
+    for chunk_type, data in chunks:
+        output += struct.pack(">I", len(data)) + chunk_type + data
+        output += struct.pack(">I", zlib.crc32(chunk_type + data))
+    return bytes(output)
+
+
+def _split_chunks(png: bytes):
+    chunks: list[tuple[bytes, bytes]] = []
+    offset = len(_PNG_SIGNATURE)
+    while offset < len(png):
+        (length,) = struct.unpack(">I", png[offset : offset + 4])
+        chunk_type = png[offset + 4 : offset + 8]
+        chunks.append((chunk_type, png[offset + 8 : offset + 8 + length]))
+        offset += 12 + length
+    return chunks
+
+
+def _read_png_chunks(path: Path):
+    try:
+        png = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    if not png.startswith(_PNG_SIGNATURE):
+        return []
+    return _split_chunks(png)
+
+
+def _text_from_chunks(chunks: list[tuple[bytes, bytes]]):
+    text: dict[str, str] = {}
+    for chunk_type, data in chunks:
+        if chunk_type == b"tEXt":
+            key, _, value = data.decode("latin-1").partition("\x00")
+            text[key] = value
+    return text
+
+
+def _with_text(chunks: list[tuple[bytes, bytes]], text: dict[str, str]):
+    """Returns the chunks with the given text entries added or replaced."""
+    kept = [
+        (chunk_type, data)
+        for chunk_type, data in chunks
+        if chunk_type != b"tEXt"
+        or data.decode("latin-1").partition("\x00")[0] not in text
+    ]
+    new_chunks = [
+        (b"tEXt", f"{key}\x00{value}".encode("latin-1")) for key, value in text.items()
+    ]
+    return kept[:1] + new_chunks + kept[1:]
+
+
+def _write_chunks(path: Path, chunks: list[tuple[bytes, bytes]]):
+    # Written to a temporary file first so concurrent readers never see a partial image.
+    temporary_path = path.with_name(path.name + ".tmp")
+    temporary_path.write_bytes(_join_chunks(chunks))
+    os.replace(temporary_path, path)
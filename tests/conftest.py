@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.fixture
+def new_level():
+    """A fresh level from the LevelFactory. Needs pytiling and the game's tileset assets."""
+    pytest.importorskip("pytiling")
+    from level.config import ASSETS_PATH
+
+    if not (ASSETS_PATH / "img/tilesets/dungeon/platforms.png").is_file():
+        pytest.skip("The game assets aren't available.")
+
+    from level.level_bootstrap._level_factory import LevelFactory
+
+    return LevelFactory().create_level()
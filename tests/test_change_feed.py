@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+from level.grid_map.change_feed import ChangeFeed, cells_to_rects
+
+
+def _covered(rects):
+    return {
+        (x, y)
+        for left, top, width, height in rects
+        for x in range(left, left + width)
+        for y in range(top, top + height)
+    }
+
+
+def test_cells_to_rects_merges_identical_runs_on_consecutive_rows():
+    cells = {(x, y) for x in range(2, 5) for y in range(1, 4)}
+    assert cells_to_rects(cells) == [(2, 1, 3, 3)]
+
+
+def test_cells_to_rects_covers_exactly_the_cells():
+    cells = {(0, 0), (1, 0), (3, 0), (1, 1), (3, 1), (3, 2), (0, 4)}
+    rects = cells_to_rects(cells)
+    assert _covered(rects) == cells
+    assert sum(width * height for _, _, width, height in rects) == len(cells)
+
+
+def test_cells_to_rects_does_not_merge_across_gaps():
+    assert sorted(cells_to_rects([(0, 0), (0, 2)])) == [(0, 0, 1, 1), (0, 2, 1, 1)]
+
+
+def _feed():
+    feed = ChangeFeed(SimpleNamespace(grid_size=(8, 8), layers=[]))
+    changes = []
+    feed.subscribe(changes.append)
+    return feed, changes
+
+
+def test_batch_emits_one_coalesced_change():
+    feed, changes = _feed()
+    with feed.batch():
+        feed.record_elements("platforms", added=[(1, 1)])
+        feed.record_elements("platforms", added=[(2, 1)], margin=1)
+    assert len(changes) == 1
+    assert changes[0].added == {"platforms": [(1, 1), (2, 1)]}
+    assert _covered(changes[0].dirty_rects["platforms"]) == {
+        (x, y) for x in range(1, 4) for y in range(0, 3)
+    }
+
+
+def test_removing_and_adding_back_the_same_element_cancels_out():
+    feed, changes = _feed()
+    element = object()
+    with feed.batch():
+        feed.record_elements("objects", removed=[(3, 3)], identity=element)
+        feed.record_elements("objects", added=[(3, 3)], identity=element)
+    assert changes[0].added == {} and changes[0].removed == {}
+
+
+def test_replacing_an_element_is_kept_as_removal_and_addition():
+    feed, changes = _feed()
+    with feed.batch():
+        feed.record_elements("objects", removed=[(3, 3)], identity=object())
+        feed.record_elements("objects", added=[(3, 3)], identity=object())
+    assert changes[0].added == {"objects": [(3, 3)]}
+    assert changes[0].removed == {"objects": [(3, 3)]}
+
+
+def test_positions_recorded_before_a_resize_follow_the_content():
+    feed, changes = _feed()
+    with feed.batch():
+        feed.record_elements("platforms", added=[(1, 1)], removed=[(0, 0)])
+        feed.record_resize((2, 1))
+        feed.record_elements("platforms", added=[(0, 0)])
+    assert changes[0].resized and changes[0].offset == (2, 1)
+    assert sorted(changes[0].added["platforms"]) == [(0, 0), (3, 2)]
+    assert changes[0].removed == {"platforms": [(2, 1)]}
+
+
+def test_end_returns_the_change_for_a_later_publish():
+    feed, changes = _feed()
+    feed.begin()
+    feed.begin()
+    feed.record_elements("platforms", added=[(1, 1)])
+    assert feed.end() is None
+    change = feed.end()
+
+    assert changes == []
+    assert change.added == {"platforms": [(1, 1)]}
+    feed.publish(change)
+    assert changes == [change]
@@ -0,0 +1,28 @@
+import os
+from level.__main__ import find_level_files
+from level.compression import write_level_data
+
+
+def test_one_level_file_per_directory(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    write_level_data({"version": 1}, tmp_path / "a" / "level.json")
+    write_level_data({"version": 2}, tmp_path / "a" / "level.json.xz")
+    os.utime(tmp_path / "a" / "level.json", ns=(1_000_000_000, 1_000_000_000))
+    write_level_data({"version": 1}, tmp_path / "b" / "level.json.zz")
+
+    assert find_level_files([str(tmp_path)]) == [
+        tmp_path / "a" / "level.json.xz",
+        tmp_path / "b" / "level.json.zz",
+    ]
+
+
+def test_explicit_files_are_kept(tmp_path):
+    write_level_data({}, tmp_path / "level.json")
+    write_level_data({}, tmp_path / "level.json.xz")
+    paths = [str(tmp_path / "level.json"), str(tmp_path / "level.json.xz")]
+
+    assert find_level_files(paths) == [
+        tmp_path / "level.json",
+        tmp_path / "level.json.xz",
+    ]
@@ -0,0 +1,70 @@
+import json
+import os
+import pytest
+from level.compression import (
+    CODECS,
+    codec_from_path,
+    decode_level_data,
+    encode_level_data,
+    find_level_file,
+    read_level_data,
+    remove_other_variants,
+    with_codec_suffix,
+    write_level_data,
+)
+
+DATA = {"name": "Level", "map": {"grid_size": [4, 3], "layers": ["a", "b"]}}
+
+
+def _available_codecs():
+    codecs = []
+    for codec in CODECS:
+        if codec == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                continue
+        codecs.append(codec)
+    return codecs
+
+
+@pytest.mark.parametrize("codec", _available_codecs())
+def test_round_trip(tmp_path, codec):
+    path = with_codec_suffix(tmp_path / "level.json", codec)
+    assert codec_from_path(path) == codec
+
+    write_level_data(DATA, path)
+    assert read_level_data(path) == DATA
+    assert json.loads(decode_level_data(encode_level_data(DATA, codec), codec)) == DATA
+
+
+def test_with_codec_suffix_replaces_the_previous_codec():
+    assert with_codec_suffix("a/level.json.xz", "zlib").name == "level.json.zz"
+    assert with_codec_suffix("a/level.json.zz", "json").name == "level.json"
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        encode_level_data(DATA, "gzip")
+
+
+def test_find_level_file_prefers_the_newest_variant(tmp_path):
+    plain = tmp_path / "level.json"
+    compressed = tmp_path / "level.json.xz"
+    write_level_data({"version": 1}, plain)
+    write_level_data({"version": 2}, compressed)
+    os.utime(plain, ns=(1_000_000_000, 1_000_000_000))
+
+    assert find_level_file(tmp_path) == compressed
+    assert find_level_file(tmp_path / "missing") is None
+
+
+def test_remove_other_variants(tmp_path):
+    plain = tmp_path / "level.json"
+    compressed = tmp_path / "level.json.zz"
+    write_level_data(DATA, plain)
+    write_level_data(DATA, compressed)
+
+    remove_other_variants(compressed)
+    assert not plain.exists()
+    assert compressed.exists()
@@ -0,0 +1,71 @@
+import gc
+from level.event_bus import EventBus
+from level.level_selector import LevelSelector
+
+
+def test_publications_are_delivered_synchronously_without_a_schedule():
+    bus = EventBus()
+    received = []
+    bus.subscribe("zoom", received.append)
+
+    bus.publish("zoom", 1)
+    bus.publish("zoom", 2)
+
+    assert received == [1, 2]
+
+
+def test_scheduled_publications_are_coalesced_per_topic():
+    scheduled = []
+    bus = EventBus(schedule=scheduled.append)
+    received = []
+    bus.subscribe("zoom", received.append)
+
+    for value in range(5):
+        bus.publish("zoom", value)
+
+    assert received == [] and len(scheduled) == 1
+    scheduled[0]()
+    assert received == [4]
+
+
+def test_unsubscribed_callbacks_stop_receiving():
+    bus = EventBus()
+    received = []
+    with bus.subscribe("zoom", received.append):
+        bus.publish("zoom", 1)
+    bus.publish("zoom", 2)
+
+    assert received == [1]
+    assert bus.subscriber_count("zoom") == 0
+
+
+def test_weak_subscriptions_end_with_their_owner():
+    class Widget:
+        def __init__(self):
+            self.received = []
+
+        def on_zoom(self, value):
+            self.received.append(value)
+
+    bus = EventBus()
+    widget = Widget()
+    bus.subscribe("zoom", widget.on_zoom, weak=True)
+    bus.publish("zoom", 1)
+    assert widget.received == [1]
+
+    del widget
+    gc.collect()
+    assert bus.subscriber_count("zoom") == 0
+
+
+def test_selector_callbacks_go_through_the_bus():
+    selector = LevelSelector()
+    received = []
+    subscription = selector.set_select_callback("tool", received.append)
+
+    selector.set_selection("tool", "eraser")
+    subscription.unsubscribe()
+    selector.set_selection("tool", "brush")
+
+    assert received == ["eraser"]
+    assert selector.get_selection("tool") == "brush"
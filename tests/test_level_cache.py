@@ -0,0 +1,53 @@
+import os
+
+
+def _locked_tiles(level):
+    return {
+        (element.layer.name, element.position)
+        for element in level.map.tilemap.all_elements
+        if element.locked
+    }
+
+
+def test_hits_and_misses_give_equivalent_new_levels(new_level, tmp_path):
+    from level.level_bootstrap import LevelCache
+
+    path = new_level.save(tmp_path / "level.json")
+    cache = LevelCache()
+
+    miss = cache.get(path)
+    hit = cache.get(path)
+
+    assert hit is not miss and hit.map is not miss.map
+    assert hit.to_hash() == miss.to_hash() == new_level.to_hash()
+    assert _locked_tiles(hit) == _locked_tiles(miss)
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_changed_files_are_read_again(new_level, tmp_path):
+    from level.level_bootstrap import LevelCache
+
+    path = new_level.save(tmp_path / "level.json")
+    cache = LevelCache()
+    cache.get(path)
+
+    new_level.map.tilemap.fill_rect((2, 1, 3, 1))
+    new_level.save(path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(path).to_hash() == new_level.to_hash()
+    assert cache.stats["misses"] == 2 and len(cache) == 1
+
+
+def test_entries_are_evicted_beyond_the_budget(new_level, tmp_path):
+    from level.level_bootstrap import LevelCache
+
+    cache = LevelCache(max_entries=1)
+    first = new_level.save(tmp_path / "first" / "level.json")
+    second = new_level.save(tmp_path / "second" / "level.json")
+
+    cache.get(first)
+    cache.get(second)
+
+    assert len(cache) == 1 and cache.stats["evictions"] == 1
@@ -0,0 +1,58 @@
+from level.grid_map.packed_grid import PackedGrid
+from level.level_diff import _align_names, _diff_grids, _estimate_offset
+
+
+def _packed(rows: list[str]):
+    """Builds a grid from rows of characters, each letter being an element name and '.' empty."""
+    names: list[str] = []
+    cells = bytearray()
+    for row in rows:
+        for char in row:
+            if char == ".":
+                cells.append(0)
+                continue
+            if char not in names:
+                names.append(char)
+            cells.append(names.index(char) + 1)
+    return PackedGrid(len(rows[0]), len(rows), cells, names)
+
+
+def test_align_names_uses_the_reference_codes():
+    reference = _packed(["ab"])
+    grid = _packed(["cb", "a."])
+    aligned = _align_names(reference, grid)
+
+    assert aligned.names[:2] == ["a", "b"]
+    for position in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        assert aligned.get(position) == grid.get(position)
+    assert aligned.row(0)[1] == reference.row(0)[1]
+
+
+def test_estimate_offset_detects_content_shifted_by_an_expansion():
+    before = _packed(["a.", "bb"])
+    after = _align_names(before, _packed(["..a.", "..bb"]))
+    assert _estimate_offset((2, 2), (4, 2), [(before, after)], []) == (2, 0)
+
+
+def test_estimate_offset_keeps_content_in_place_when_expanded_on_the_far_side():
+    before = _packed(["a.", "bb"])
+    after = _align_names(before, _packed(["a...", "bb.."]))
+    assert _estimate_offset((2, 2), (4, 2), [(before, after)], []) == (0, 0)
+
+
+def test_diff_grids_reports_changes_in_each_grid_coordinates():
+    before = _packed(["a.", "bb"])
+    after = _align_names(before, _packed(["..ab", "..b."]))
+    added, removed = _diff_grids(before, after, (2, 0))
+
+    assert sorted(added) == [(3, 0)]
+    assert sorted(removed) == [(1, 1)]
+
+
+def test_diff_grids_counts_replacements_as_removal_and_addition():
+    before = _packed(["ab"])
+    after = _align_names(before, _packed(["bb"]))
+    added, removed = _diff_grids(before, after, (0, 0))
+
+    assert added == [(0, 0)]
+    assert removed == [(0, 0)]
@@ -0,0 +1,27 @@
+import threading
+
+
+def test_load_level_async_builds_the_saved_level(new_level, tmp_path):
+    from level.level_bootstrap import LevelLoader
+
+    new_level.save(tmp_path / "level.json")
+    loader = LevelLoader()
+    own_level = loader.level
+    called = threading.Event()
+
+    future = loader.load_level_async(tmp_path, callback=lambda _: called.set())
+    loaded = future.result(timeout=10)
+
+    assert loaded.to_hash() == new_level.to_hash()
+    assert loader.level is own_level
+    assert called.wait(timeout=10)
+
+
+def test_load_level_async_resolves_to_none_without_a_level_file(new_level, tmp_path):
+    from level.level_bootstrap import LevelLoader
+
+    loader = LevelLoader()
+    own_level = loader.level
+
+    assert loader.load_level_async(tmp_path).result(timeout=10) is None
+    assert loader.level is own_level
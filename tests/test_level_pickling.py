@@ -0,0 +1,37 @@
+import copy
+import pickle
+
+
+def _locked_tiles(level):
+    return {
+        (element.layer.name, element.position)
+        for element in level.map.tilemap.all_elements
+        if element.locked
+    }
+
+
+def test_pickled_level_keeps_its_content_and_locks(new_level):
+    new_level.name = "Pickled"
+    new_level.map.tilemap.lock_edge("left")
+    goal = new_level.map.get_layer("essentials").get_element_at((5, 3))
+    goal.add_tag("shiny")
+    goal.locked = True
+
+    restored = pickle.loads(pickle.dumps(new_level))
+
+    assert restored.name == "Pickled"
+    assert restored.to_hash() == new_level.to_hash()
+    assert _locked_tiles(restored) == _locked_tiles(new_level) != set()
+    assert restored.map.tilemap.locked_edges == {"left"}
+    assert restored.map.layer_concurrences == new_level.map.layer_concurrences
+
+
+def test_tile_locks_survive_a_level_loaded_from_a_file(new_level, tmp_path):
+    from level.level import Level
+
+    path = new_level.save(tmp_path / "level.json")
+    loaded = Level.load(path)
+    loaded.map.tilemap.lock_edge("top")
+    loaded.map.tilemap.locked_edges.clear()
+
+    assert _locked_tiles(copy.deepcopy(loaded)) == _locked_tiles(loaded) != set()
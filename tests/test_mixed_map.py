@@ -0,0 +1,83 @@
+import copy
+import pickle
+import threading
+import pytest
+
+pytest.importorskip("pytiling")
+
+from level.grid_map import MixedMap
+from level.grid_map.world_objects_map import WorldObjectsLayer
+
+
+def _map():
+    mixed_map = MixedMap((16, 16), (8, 8), (5, 5), (12, 12))
+    mixed_map.world_objects_map.add_layer(WorldObjectsLayer("essentials", "icon.svg"))
+    mixed_map.populate_layers()
+    return mixed_map
+
+
+@pytest.mark.parametrize(
+    "duplicate",
+    [copy.deepcopy, lambda mixed_map: pickle.loads(pickle.dumps(mixed_map))],
+)
+def test_map_can_be_copied_with_a_fresh_lock(duplicate):
+    mixed_map = _map()
+    layer = mixed_map.get_world_objects_layer("essentials")
+    layer.create_world_object_at((2, 3), "delver", unique=True)
+
+    copied = duplicate(mixed_map)
+
+    assert copied.lock is not mixed_map.lock
+    assert copied.world_objects_map.mixed_map is copied
+    assert [
+        (world_object.position, world_object.name)
+        for world_object in copied.world_objects_map.all_world_objects
+    ] == [((2, 3), "delver")]
+    with copied.batch():
+        copied.get_world_objects_layer("essentials").create_world_object_at(
+            (4, 4), "goal"
+        )
+
+
+def test_batch_notifies_subscribers_after_releasing_the_write_lock():
+    mixed_map = _map()
+    readable = []
+
+    def on_change(change):
+        # A reader on another thread would block until the timeout if the lock were still held.
+        def read():
+            with mixed_map.lock.read():
+                pass
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=1)
+        readable.append(not reader.is_alive())
+
+    mixed_map.changes.subscribe(on_change)
+    with mixed_map.batch():
+        mixed_map.get_world_objects_layer("essentials").create_world_object_at(
+            (1, 1), "delver"
+        )
+
+    assert readable == [True]
+
+
+def test_window_codes_stay_stable_across_edits():
+    mixed_map = _map()
+    layer = mixed_map.get_world_objects_layer("essentials")
+    goal = layer.create_world_object_at((1, 1), "goal")
+    layer.create_world_object_at((3, 1), "delver")
+    names = {}
+    first = mixed_map.extract_windows([(2, 1)], 3, element_names=names)
+
+    with mixed_map.batch():
+        layer.remove_element(goal)
+        layer.create_world_object_at((2, 1), "goal")
+    out = bytearray(len(first))
+    second = mixed_map.extract_windows([(2, 1)], 3, out=out, element_names=names)
+
+    assert names == {"essentials": ["goal", "delver"]}
+    assert list(first) == [0, 0, 0, 1, 0, 2, 0, 0, 0]
+    assert second is out
+    assert list(out) == [0, 0, 0, 0, 1, 2, 0, 0, 0]
@@ -0,0 +1,42 @@
+def _rebuilt_cells(mixed_map):
+    from level.grid_map.occupancy_map import OccupancyMap
+
+    occupancy = OccupancyMap(mixed_map)
+    occupancy.rebuild()
+    return occupancy.cells
+
+
+def test_concurrent_layers_conflict(new_level):
+    mixed_map = new_level.map
+
+    assert mixed_map.conflicts_at((1, 3), "platforms")
+    assert not mixed_map.conflicts_at((2, 3), "platforms")
+    assert not mixed_map.is_cell_free((0, 0), "essentials")
+    assert mixed_map.is_cell_free((2, 2), "essentials")
+    assert mixed_map.find_free_cell("platforms", start=(1, 1)) == (2, 1)
+    assert (1, 3) not in mixed_map.free_cells("platforms")
+
+
+def test_placements_rejected_by_the_bitmap(new_level):
+    mixed_map = new_level.map
+    essentials = mixed_map.get_world_objects_layer("essentials")
+
+    assert mixed_map.tilemap.create_basic_platform_at((1, 3)) is None
+    essentials.create_world_object_at((0, 0), "chest")
+    assert essentials.get_element_at((0, 0)) is None
+
+
+def test_bitmap_stays_in_sync_with_every_edit_path(new_level):
+    mixed_map = new_level.map
+    tilemap = mixed_map.tilemap
+    platforms = tilemap.get_layer("platforms")
+    essentials = mixed_map.get_world_objects_layer("essentials")
+    mixed_map.is_cell_free((0, 0))
+
+    tilemap.fill_rect((2, 1, 2, 1))
+    platforms.create_autotile_tile_at((4, 5), "platform")
+    platforms.remove_tile_at((2, 1))
+    essentials.create_world_object_at((3, 4), "delver", unique=True)
+
+    assert not mixed_map.occupancy.is_stale
+    assert mixed_map.occupancy.cells == _rebuilt_cells(mixed_map)
@@ -0,0 +1,40 @@
+def test_fill_and_clear_rect_emit_one_change_each(new_level):
+    tilemap = new_level.map.tilemap
+    platforms = tilemap.get_layer("platforms")
+    changes = []
+    new_level.map.changes.subscribe(changes.append)
+    rect_positions = [(x, y) for y in (1, 2) for x in (2, 3, 4)]
+
+    created, removed = tilemap.fill_rect((2, 1, 3, 2))
+
+    assert sorted(created) == sorted(rect_positions) and removed == []
+    assert all(platforms.get_tile_at(position) for position in rect_positions)
+    assert len(changes) == 1
+    assert sorted(changes[0].added["platforms"]) == sorted(rect_positions)
+
+    created, removed = tilemap.clear_rect((2, 1, 3, 2))
+
+    assert created == [] and sorted(removed) == sorted(rect_positions)
+    assert not any(platforms.get_tile_at(position) for position in rect_positions)
+    assert len(changes) == 2
+
+
+def test_region_edits_skip_cells_taken_by_a_concurrent_layer(new_level):
+    tilemap = new_level.map.tilemap
+
+    created, _ = tilemap.fill_rect((1, 3, 2, 1))
+
+    assert created == [(2, 3)]
+    assert tilemap.get_layer("platforms").get_tile_at((1, 3)) is None
+
+
+def test_apply_mask_creates_and_clears_cells(new_level):
+    tilemap = new_level.map.tilemap
+    platforms = tilemap.get_layer("platforms")
+    tilemap.fill_rect((3, 4, 1, 1))
+
+    created, removed = tilemap.apply_mask([[True, False]], origin=(2, 4))
+
+    assert created == [(2, 4)] and removed == [(3, 4)]
+    assert platforms.get_tile_at((2, 4)) is not None
+    assert platforms.get_tile_at((3, 4)) is None
@@ -0,0 +1,25 @@
+def test_resize_to_expands_several_edges_in_one_change(new_level):
+    mixed_map = new_level.map
+    changes = []
+    mixed_map.changes.subscribe(changes.append)
+
+    mixed_map.resize_to((-1, -2, 9, 7))
+
+    assert mixed_map.grid_size == (10, 9)
+    assert new_level.map.get_layer("essentials").get_element_at((2, 5)).name == "delver"
+    platforms = mixed_map.tilemap.get_layer("platforms")
+    border = [(0, y) for y in range(9)] + [(x, 0) for x in range(10)]
+    border += [(x, y) for x in (8, 9) for y in range(9)]
+    assert all(platforms.get_tile_at(position) is not None for position in border)
+
+    assert len(changes) == 1
+    assert changes[0].resized and changes[0].offset == (1, 2)
+
+
+def test_resize_to_clamps_to_the_maximum_size(new_level):
+    mixed_map = new_level.map
+    max_width, max_height = mixed_map.max_grid_size
+
+    mixed_map.resize_to((0, 0, max_width + 10, max_height + 10))
+
+    assert mixed_map.grid_size == (max_width, max_height)
@@ -0,0 +1,100 @@
+import threading
+import pytest
+from level.rw_lock import ReadWriteLock
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.read():
+            both_reading.wait()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    read()
+    thread.join()
+
+
+def test_writer_waits_for_readers():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def write():
+        with lock.write():
+            events.append("write")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    thread.join(0.1)
+    events.append("read done")
+    lock.release_read()
+    thread.join(5)
+
+    assert events == ["read done", "write"]
+
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def write():
+        with lock.write():
+            events.append("write")
+
+    def read():
+        with lock.read():
+            events.append("read")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while not lock._waiting_writers:
+        writer.join(0.01)
+    reader = threading.Thread(target=read)
+    reader.start()
+    reader.join(0.1)
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+
+    assert events == ["write", "read"]
+
+
+def test_locks_are_reentrant_and_writer_may_read():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+    with lock.read():
+        with lock.read():
+            pass
+
+
+def test_read_lock_cannot_be_upgraded():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+
+def test_releasing_unheld_locks_fails():
+    lock = ReadWriteLock()
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+
+def test_holds_read_only():
+    lock = ReadWriteLock()
+    assert not lock.holds_read_only()
+    with lock.read():
+        assert lock.holds_read_only()
+    with lock.write():
+        assert not lock.holds_read_only()
+        with lock.read():
+            assert not lock.holds_read_only()
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("pytiling")
+
+from level.grid_map.packed_grid import PackedGrid
+from level.grid_map.world_objects_map.world_object import WorldObjectRow
+from level.shared_level_pool import SharedLevelPool, SharedLevelPoolReader
+
+
+def _level(name: str, cells: bytes, world_objects: list[WorldObjectRow]):
+    """A stand-in exposing what the pool reads from a level."""
+    grid = PackedGrid(3, 2, bytearray(cells), ["platform"])
+    return SimpleNamespace(
+        name=name,
+        map=SimpleNamespace(
+            grid_size=(3, 2),
+            layers=[SimpleNamespace(name="platforms")],
+            pack_layer=lambda layer_name: grid,
+            world_objects_map=SimpleNamespace(
+                layers=[SimpleNamespace(name="essentials")],
+                layer_arrays=lambda layer_name: world_objects,
+            ),
+        ),
+    )
+
+
+def test_readers_see_each_published_generation():
+    delver = WorldObjectRow((1, 0), "delver", ("fast",), False, True)
+    with SharedLevelPool() as pool:
+        pool.publish({"first": _level("First", b"\x01\x00\x01\x00\x00\x01", [delver])})
+
+        with SharedLevelPoolReader(pool.name) as reader:
+            view = reader.get("first")
+            assert reader.generation == 1 and reader.ids == ["first"]
+            assert view.name == "First" and view.grid_size == (3, 2)
+            assert bytes(view.cells("platforms")) == b"\x01\x00\x01\x00\x00\x01"
+            assert view.names("platforms") == ["platform"]
+            assert view.world_objects == [delver]
+            window = view.extract_windows([(0, 0)], 3, pad=9)
+            assert list(window) == [9, 9, 9, 9, 1, 0, 9, 0, 0]
+            del view
+
+            assert not reader.refresh()
+            pool.publish([_level("Second", b"\x00" * 6, [])])
+            assert reader.refresh()
+            assert reader.generation == 2 and reader.ids == [0]
+            assert reader.get(0).packed_grid("platforms").occupied_count() == 0
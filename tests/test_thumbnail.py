@@ -0,0 +1,60 @@
+import struct
+import zlib
+from level.thumbnail import (
+    THUMBNAIL_FILE_NAME,
+    _encode_png,
+    _source_stamp,
+    _split_chunks,
+    _text_from_chunks,
+    _with_text,
+    ensure_thumbnail,
+    render_thumbnail,
+)
+
+
+def test_png_chunks_round_trip_with_text():
+    png = _encode_png(2, 1, [b"\x01\x02\x03\x04\x05\x06"], {"level-hash": "abc"})
+    chunks = _split_chunks(png)
+
+    assert [chunk_type for chunk_type, _ in chunks] == [
+        b"IHDR",
+        b"tEXt",
+        b"IDAT",
+        b"IEND",
+    ]
+    assert struct.unpack(">II", chunks[0][1][:8]) == (2, 1)
+    assert zlib.decompress(chunks[2][1]) == b"\x00\x01\x02\x03\x04\x05\x06"
+    assert _text_from_chunks(chunks) == {"level-hash": "abc"}
+
+
+def test_with_text_replaces_entries_after_the_header():
+    chunks = _split_chunks(_encode_png(1, 1, [b"\x00\x00\x00"], {"a": "1", "b": "2"}))
+    updated = _with_text(chunks, {"a": "3"})
+
+    assert updated[0][0] == b"IHDR"
+    assert _text_from_chunks(updated) == {"a": "3", "b": "2"}
+
+
+def test_source_stamp_depends_on_the_scale(tmp_path):
+    path = tmp_path / "level.json"
+    path.write_text("{}")
+
+    assert _source_stamp(path, 2) != _source_stamp(path, 3)
+
+
+def test_thumbnail_is_rendered_once_per_level_file(new_level, tmp_path):
+    new_level.save(tmp_path / "level.json")
+
+    png = render_thumbnail(new_level, scale=3)
+    header = _split_chunks(png)[0][1]
+    width, height = new_level.map.grid_size
+    assert struct.unpack(">II", header[:8]) == (width * 3, height * 3)
+
+    path = ensure_thumbnail(tmp_path, scale=3)
+    assert path == tmp_path / THUMBNAIL_FILE_NAME
+    text = _text_from_chunks(_split_chunks(path.read_bytes()))
+    assert text["level-hash"] == new_level.to_hash()
+
+    modified = path.stat().st_mtime_ns
+    assert ensure_thumbnail(tmp_path, scale=3) == path
+    assert path.stat().st_mtime_ns == modified
@@ -0,0 +1,44 @@
+import pytest
+from level.grid_map.windowing import extract_windows
+
+
+def _grid(width, height):
+    return bytearray(y * width + x + 1 for y in range(height) for x in range(width))
+
+
+def _window(out, index, layer_count, layer, size):
+    start = (index * layer_count + layer) * size * size
+    window = out[start : start + size * size]
+    return [list(window[row * size : (row + 1) * size]) for row in range(size)]
+
+
+def test_window_inside_the_map():
+    grid = _grid(5, 4)
+    out = extract_windows([grid], (5, 4), [(2, 1)], 3)
+    assert _window(out, 0, 1, 0, 3) == [[2, 3, 4], [7, 8, 9], [12, 13, 14]]
+
+
+def test_window_crossing_the_border_is_padded():
+    grid = _grid(5, 4)
+    out = extract_windows([grid], (5, 4), [(0, 0), (4, 3)], 3, pad=255)
+    assert _window(out, 0, 1, 0, 3) == [[255, 255, 255], [255, 1, 2], [255, 6, 7]]
+    assert _window(out, 1, 1, 0, 3) == [[14, 15, 255], [19, 20, 255], [255] * 3]
+
+
+def test_layout_is_position_then_layer():
+    first = _grid(3, 3)
+    second = bytearray(value + 100 for value in first)
+    out = extract_windows([first, second], (3, 3), [(1, 1), (0, 0)], 1)
+    assert list(out) == [5, 105, 1, 101]
+
+
+def test_fills_the_given_buffer():
+    out = bytearray(9)
+    result = extract_windows([_grid(3, 3)], (3, 3), [(1, 1)], 3, out=out)
+    assert result is out
+    assert list(out) == list(range(1, 10))
+
+
+def test_rejects_a_small_buffer():
+    with pytest.raises(ValueError):
+        extract_windows([_grid(3, 3)], (3, 3), [(1, 1)], 3, out=bytearray(8))
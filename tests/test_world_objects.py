@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("pytiling")
+
+from level.grid_map.world_objects_map.world_object import (
+    WorldObjectArrays,
+    WorldObjectRepresentation,
+)
+from level.grid_map.world_objects_map.world_object.world_object_representation import (
+    intern_tags,
+)
+
+
+def test_intern_tags_shares_one_sorted_tuple_per_tag_set():
+    first = intern_tags(["b", "a", "a"])
+    second = intern_tags(("a", "b"))
+
+    assert first == ("a", "b")
+    assert first is second
+
+
+def test_world_objects_with_the_same_tags_share_them():
+    first = WorldObjectRepresentation((1, 1), "goal", tags=["variation_x", "shiny"])
+    second = WorldObjectRepresentation((2, 1), "goal", tags=["shiny", "variation_x"])
+    second.add_tag("shiny")
+
+    assert first.tags is second.tags
+    assert first.canvas_object_name == "x"
+
+
+def test_arrays_round_trip_the_objects():
+    delver = WorldObjectRepresentation((1, 3), "delver")
+    delver.unique = True
+    goal = WorldObjectRepresentation((5, 3), "goal", tags=["b", "a"])
+    goal.locked = True
+    objects = [delver, goal, WorldObjectRepresentation((2, 2), "goal")]
+
+    arrays = WorldObjectArrays.from_objects(objects)
+
+    assert len(arrays) == 3
+    assert arrays.names == ["delver", "goal"]
+    assert arrays.positions_of("goal") == [(5, 3), (2, 2)]
+    assert arrays[0].unique and not arrays[0].locked
+    assert arrays[1].locked and arrays[1].tags == ("a", "b")
+    assert arrays.to_dicts() == [world_object.to_dict() for world_object in objects]